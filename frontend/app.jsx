@@ -1,4 +1,10 @@
-const { useState, useEffect } = React;
+const { useState, useEffect, useRef } = React;
+
+// Month views kept in memory so navigating back and forth doesn't refetch from Google.
+const CALENDAR_CACHE_MAX_MONTHS = 12;
+const CALENDAR_CACHE_TTL_MS = 60 * 1000;
+// Quiet period after prev/next clicks before an uncached month is fetched.
+const CALENDAR_NAV_DEBOUNCE_MS = 250;
 
 const ModernApp = ()=>{
   const { t, lang, setLanguage, languages } = useTranslation();
@@ -139,33 +145,127 @@ const ModernApp = ()=>{
     }
   };
 
-  const fetchCalendarEvents = async (targetMonth = calendarMonth) => {
+  // Map of 'YYYY-MM' -> { events, fetchedAt }, kept in least-recently-used order.
+  const calendarCacheRef = useRef(new Map());
+
+  const readCalendarCache = (monthKey) => {
+    const cache = calendarCacheRef.current;
+    const entry = cache.get(monthKey);
+    if (!entry || Date.now() - entry.fetchedAt > CALENDAR_CACHE_TTL_MS) {
+      return null;
+    }
+    cache.delete(monthKey);
+    cache.set(monthKey, entry);
+    return entry.events;
+  };
+
+  const writeCalendarCache = (monthKey, events) => {
+    const cache = calendarCacheRef.current;
+    cache.delete(monthKey);
+    cache.set(monthKey, { events, fetchedAt: Date.now() });
+    while (cache.size > CALENDAR_CACHE_MAX_MONTHS) {
+      cache.delete(cache.keys().next().value);
+    }
+  };
+
+  // The foreground month request in flight; a newer navigation aborts it so responses
+  // can't land out of order and overwrite the month on screen.
+  const calendarRequestRef = useRef(null);
+
+  const fetchCalendarEvents = async (targetMonth = calendarMonth, { background = false, force = false } = {}) => {
     if (!targetMonth) {
       return null;
     }
 
-    setCalendarLoading(true);
-    setCalendarError(null);
+    let controller = null;
+    if (!background) {
+      if (calendarRequestRef.current) calendarRequestRef.current.abort();
+      controller = new AbortController();
+      calendarRequestRef.current = controller;
+    }
+
+    const monthKey = formatMonthParam(targetMonth);
+    if (!force) {
+      const cached = readCalendarCache(monthKey);
+      if (cached) {
+        if (!background) {
+          calendarRequestRef.current = null;
+          setCalendarEvents(cached);
+          setCalendarError(null);
+          setCalendarLoading(false);
+        }
+        return cached;
+      }
+    }
+
+    if (!background) {
+      setCalendarLoading(true);
+      setCalendarError(null);
+    }
     try {
       const params = new URLSearchParams({
-        month: formatMonthParam(targetMonth),
+        month: monthKey,
         max_results: '200'
       });
-      const response = await fetch(`/calendar/events?${params.toString()}`);
+      const response = await fetch(`/calendar/events?${params.toString()}`, controller ? { signal: controller.signal } : undefined);
       if (!response.ok) {
         throw new Error('Calendar request failed');
       }
       const data = await response.json();
-      setCalendarEvents(Array.isArray(data) ? data : []);
-      return data;
+      const events = Array.isArray(data) ? data : [];
+      writeCalendarCache(monthKey, events);
+      if (!background) {
+        setCalendarEvents(events);
+        // Warm the neighbouring months so prev/next navigation renders from memory.
+        [-1, 1].forEach((offset) => {
+          const neighbour = new Date(targetMonth.getFullYear(), targetMonth.getMonth() + offset, 1);
+          fetchCalendarEvents(neighbour, { background: true });
+        });
+      }
+      return events;
     } catch (err) {
-      setCalendarError('Failed to fetch calendar events.');
+      if (err.name === 'AbortError') return null;
+      if (!background) setCalendarError('Failed to fetch calendar events.');
       return null;
     } finally {
-      setCalendarLoading(false);
+      if (controller && calendarRequestRef.current === controller) {
+        calendarRequestRef.current = null;
+        setCalendarLoading(false);
+      }
     }
   };
 
+  // Events created outside the calendar page (e.g. from an email's proposals) aren't known
+  // locally; drop every cached month so the next calendar visit refetches.
+  const invalidateCalendarCache = () => {
+    calendarCacheRef.current.clear();
+  };
+
+  // When the changed event isn't known locally (e.g. an accepted proposal), drop every cached
+  // month and refetch the one on screen.
+  const reloadCalendarEvents = () => {
+    calendarCacheRef.current.clear();
+    return fetchCalendarEvents(calendarMonth, { force: true });
+  };
+
+  const eventOverlapsMonth = (event, month) => {
+    const first = new Date(month.getFullYear(), month.getMonth(), 1);
+    const next = new Date(month.getFullYear(), month.getMonth() + 1, 1);
+    const start = new Date(event.start?.dateTime || event.start?.date);
+    const end = new Date(event.end?.dateTime || event.end?.date || start);
+    return start < next && end >= first;
+  };
+
+  // Apply a confirmed create/update/delete to the month on screen instead of refetching it.
+  // Other cached months may be affected too (events move and span months), so they are
+  // dropped and reload lazily when navigated to.
+  const applyCalendarMutation = (mutate) => {
+    const next = mutate(Array.isArray(calendarEvents) ? calendarEvents : []);
+    calendarCacheRef.current.clear();
+    writeCalendarCache(formatMonthParam(calendarMonth), next);
+    setCalendarEvents(next);
+  };
+
   // Queue management effect
   useEffect(() => {
     if (!isLoggedIn) return;
@@ -283,9 +383,22 @@ const ModernApp = ()=>{
   }, [emailPage, activeFolder, isLoggedIn]);
 
   useEffect(() => {
-    if (isLoggedIn && page === '/calendar') {
-      fetchCalendarEvents(calendarMonth);
+    if (!isLoggedIn || page !== '/calendar') {
+      return undefined;
     }
+    // Cached months render right away; uncached ones wait for clicking to settle so
+    // holding prev/next doesn't fire one request per intermediate month.
+    const delay = readCalendarCache(formatMonthParam(calendarMonth)) ? 0 : CALENDAR_NAV_DEBOUNCE_MS;
+    const timer = setTimeout(() => fetchCalendarEvents(calendarMonth), delay);
+    return () => {
+      clearTimeout(timer);
+      // Abort the previous month's request now rather than when the debounced fetch starts,
+      // so its response can't land in the meantime and overwrite the new month.
+      if (calendarRequestRef.current) {
+        calendarRequestRef.current.abort();
+        calendarRequestRef.current = null;
+      }
+    };
   }, [calendarMonth, isLoggedIn, page]);
   
   const handleEmailPageChange = (newPage) => {
@@ -326,6 +439,7 @@ const ModernApp = ()=>{
     setIsLoggedIn(false);
     setUser(null);
     setMailbox(null);
+    calendarCacheRef.current.clear();
     setCalendarEvents([]);
     setCalendarError(null);
     setCalendarMonth(new Date());
@@ -334,11 +448,30 @@ const ModernApp = ()=>{
     navigate('/');
   }
 
+  // Coalesce reloads after bursts of mailbox actions (e.g. deleting several emails in a row)
+  // into one forced fetch of whatever page is showing when the timer fires.
+  const emailReloadTimerRef = useRef(null);
+  const latestFetchEmailsRef = useRef(fetchEmails);
+  const latestEmailViewRef = useRef({ folder: activeFolder, page: emailPage });
+  latestFetchEmailsRef.current = fetchEmails;
+  latestEmailViewRef.current = { folder: activeFolder, page: emailPage };
+
+  const scheduleEmailReload = (delayMs = 300) => {
+    if (emailReloadTimerRef.current) clearTimeout(emailReloadTimerRef.current);
+    emailReloadTimerRef.current = setTimeout(() => {
+      emailReloadTimerRef.current = null;
+      const { folder, page } = latestEmailViewRef.current;
+      latestFetchEmailsRef.current({ folder, page, force: true });
+    }, delayMs);
+  };
+
+  useEffect(() => () => clearTimeout(emailReloadTimerRef.current), []);
+
   const handleDeleteEmail = async (emailId) => {
     try {
       const response = await fetch(`/emails/${emailId}`, { method: 'DELETE' });
       if (response.ok) {
-        fetchEmails({ folder: activeFolder, page: emailPage });
+        scheduleEmailReload();
       } else {
         const errorData = await response.json();
         setError(errorData.detail || "Failed to delete email.");
@@ -356,7 +489,17 @@ const ModernApp = ()=>{
         body: JSON.stringify(eventData),
       });
       if (response.ok) {
-        fetchCalendarEvents(calendarMonth);
+        const { event_id: eventId } = await response.json();
+        const created = {
+          id: eventId,
+          summary: eventData.title,
+          description: eventData.notes,
+          start: { dateTime: eventData.start },
+          end: { dateTime: eventData.end },
+        };
+        applyCalendarMutation((events) => (
+          eventOverlapsMonth(created, calendarMonth) ? [...events, created] : events
+        ));
         return true;
       } else {
         const errorData = await response.json();
@@ -377,7 +520,18 @@ const ModernApp = ()=>{
         body: JSON.stringify(updates),
       });
       if (response.ok) {
-        fetchCalendarEvents(calendarMonth);
+        applyCalendarMutation((events) => events.flatMap((event) => {
+          if (event.id !== eventId) return [event];
+          const updated = {
+            ...event,
+            summary: updates.summary,
+            description: updates.description,
+            start: { dateTime: updates.start },
+            end: { dateTime: updates.end },
+          };
+          // Drop it from this month if the edit moved it elsewhere
+          return eventOverlapsMonth(updated, calendarMonth) ? [updated] : [];
+        }));
         return true;
       } else {
         const errorData = await response.json();
@@ -394,7 +548,7 @@ const ModernApp = ()=>{
     try {
       const response = await fetch(`/calendar/events/${eventId}`, { method: 'DELETE' });
       if (response.ok) {
-        fetchCalendarEvents(calendarMonth);
+        applyCalendarMutation((events) => events.filter((event) => event.id !== eventId));
         return true;
       } else {
         const errorData = await response.json();
@@ -450,6 +604,7 @@ const ModernApp = ()=>{
           activeFolder={activeFolder}
           onFolderChange={handleFolderChange}
           onRefresh={handleRefresh}
+          onCalendarChanged={invalidateCalendarCache}
         />
       );
       case 'calendar': return (
@@ -463,6 +618,7 @@ const ModernApp = ()=>{
           onCreateEvent={handleCreateEvent}
           onUpdateEvent={handleUpdateEvent}
           onDeleteEvent={handleDeleteEvent}
+          onEventsChanged={reloadCalendarEvents}
         />
       );
       case 'settings': return <SettingsView user={user} onAutomationActivity={handleAutomationActivity} />;
@@ -1,4 +1,74 @@
-const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange, onResetMonth, onCreateEvent, onUpdateEvent, onDeleteEvent }) => {
+const toDateKey = (date) => {
+  const year = date.getFullYear();
+  const month = String(date.getMonth() + 1).padStart(2, '0');
+  const day = String(date.getDate()).padStart(2, '0');
+  return `${year}-${month}-${day}`;
+};
+
+// Month grid layouts depend only on (year, month), so they are computed once and reused
+// across renders and navigations. Each entry is null for a padding slot, else { key, day }.
+const MONTH_CELLS_CACHE = new Map();
+const MONTH_CELLS_CACHE_MAX = 64;
+
+const getMonthCells = (year, monthIndex) => {
+  const cacheKey = `${year}-${monthIndex}`;
+  const cached = MONTH_CELLS_CACHE.get(cacheKey);
+  if (cached) {
+    return cached;
+  }
+  const startOffset = new Date(year, monthIndex, 1).getDay();
+  const daysInMonth = new Date(year, monthIndex + 1, 0).getDate();
+  const cells = [];
+  for (let i = 0; i < startOffset; i += 1) {
+    cells.push(null);
+  }
+  for (let day = 1; day <= daysInMonth; day += 1) {
+    cells.push({ key: toDateKey(new Date(year, monthIndex, day)), day });
+  }
+  while (cells.length % 7 !== 0) {
+    cells.push(null);
+  }
+  if (MONTH_CELLS_CACHE.size >= MONTH_CELLS_CACHE_MAX) {
+    MONTH_CELLS_CACHE.delete(MONTH_CELLS_CACHE.keys().next().value);
+  }
+  MONTH_CELLS_CACHE.set(cacheKey, cells);
+  return cells;
+};
+
+// Day-cell styles are shared by every cell instead of being rebuilt per cell per render.
+// A cell is in one of three states (today, has events, empty), so each gets one object.
+const DAY_CELL_BASE_STYLE = {minHeight:120,borderRadius:12,padding:10,textAlign:'left',display:'flex',flexDirection:'column',gap:6};
+const DAY_CELL_TODAY_STYLE = {...DAY_CELL_BASE_STYLE,border:'1px solid #2563eb',background:'#dbeafe'};
+const DAY_CELL_BUSY_STYLE = {...DAY_CELL_BASE_STYLE,border:'1px solid #94a3b8',background:'#eef2ff'};
+const DAY_CELL_EMPTY_STYLE = {...DAY_CELL_BASE_STYLE,border:'1px solid #eef2f7',background:'#f8fafc'};
+const DAY_HEADER_STYLE = {display:'flex',justifyContent:'space-between',alignItems:'center'};
+const DAY_NUMBER_STYLE = {fontWeight:700,color:'#0f172a'};
+const DAY_TODAY_BADGE_STYLE = {fontSize:11,color:'#2563eb',fontWeight:600};
+const DAY_EVENTS_STYLE = {flex:1,display:'flex',flexDirection:'column',gap:4};
+const EVENT_CHIP_STYLE = {cursor:'pointer',fontSize:11,color:'#1e1b4b',padding:'3px 6px',borderRadius:999,background:'#c7d2fe',whiteSpace:'nowrap',overflow:'hidden',textOverflow:'ellipsis'};
+const DAY_NO_EVENTS_STYLE = {fontSize:11,color:'#94a3b8'};
+const DAY_MORE_EVENTS_STYLE = {fontSize:11,color:'#4c1d95'};
+
+// Local "YYYY-MM-DDTHH:mm" value for input[type="datetime-local"], shared by the create and
+// edit forms of the one event modal.
+const toLocalInputValue = (value) => {
+  if (!value) return '';
+  const date = new Date(value);
+  const offset = date.getTimezoneOffset() * 60000;
+  return new Date(date.getTime() - offset).toISOString().slice(0, 16);
+};
+
+// datetime-local values are local time; the backend expects ISO strings.
+const localInputToISO = (localStr) => new Date(localStr).toISOString();
+
+// toLocale*String builds a new Intl formatter on every call; the grid, recent list and
+// proposal cards format dozens of dates per render, so the formatters are built once here.
+const MONTH_LABEL_FORMAT = new Intl.DateTimeFormat('en-US', { year: 'numeric', month: 'long' });
+const EVENT_TIME_FORMAT = new Intl.DateTimeFormat([], { hour: '2-digit', minute: '2-digit' });
+const DAY_BADGE_FORMAT = new Intl.DateTimeFormat('en-US', { month: 'short', day: 'numeric' });
+const PROPOSAL_DATE_FORMAT = new Intl.DateTimeFormat('en-US', { month: 'short', day: 'numeric', hour: '2-digit', minute: '2-digit' });
+
+const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange, onResetMonth, onCreateEvent, onUpdateEvent, onDeleteEvent, onEventsChanged }) => {
   const { t } = useTranslation();
   const [selectedEvent, setSelectedEvent] = React.useState(null);
   const [isEditing, setIsEditing] = React.useState(false);
@@ -34,8 +104,8 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
       if (resp.ok) {
         await fetchProposals();
         setSelectedProposal(null);
-        // Trigger calendar refresh if parent provides callback
-        if (onResetMonth) onResetMonth();
+        // The accepted proposal is now a calendar event; refetch so it shows up
+        if (onEventsChanged) onEventsChanged();
       }
     } catch (err) {
       console.error('Failed to accept proposal:', err);
@@ -71,62 +141,42 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
     setIsCreating(true);
     const now = new Date();
     const oneHourLater = new Date(now.getTime() + 60 * 60 * 1000);
-    // Adjust to local ISO string for input[type="datetime-local"]
-    const toLocalISO = (date) => {
-      const offset = date.getTimezoneOffset() * 60000;
-      return new Date(date.getTime() - offset).toISOString().slice(0, 16);
-    };
-    
     setEditForm({
       summary: '',
       description: '',
-      start: toLocalISO(now),
-      end: toLocalISO(oneHourLater),
+      start: toLocalInputValue(now),
+      end: toLocalInputValue(oneHourLater),
     });
   };
 
   const handleEditClick = () => {
     setIsEditing(true);
     setIsCreating(false);
-    const toLocalISO = (dateStr) => {
-        if (!dateStr) return '';
-        const date = new Date(dateStr);
-        const offset = date.getTimezoneOffset() * 60000;
-        return new Date(date.getTime() - offset).toISOString().slice(0, 16);
-    };
-
     setEditForm({
       summary: selectedEvent.summary,
       description: selectedEvent.description,
-      start: toLocalISO(selectedEvent.start?.dateTime || selectedEvent.start?.date),
-      end: toLocalISO(selectedEvent.end?.dateTime || selectedEvent.end?.date),
+      start: toLocalInputValue(selectedEvent.start?.dateTime || selectedEvent.start?.date),
+      end: toLocalInputValue(selectedEvent.end?.dateTime || selectedEvent.end?.date),
     });
   };
 
   const handleSaveClick = async () => {
     if (isCreating && onCreateEvent) {
-        // Convert back to ISO string with timezone if needed, or just send as is if backend handles it.
-        // The backend expects ISO strings. The input gives "YYYY-MM-DDTHH:mm".
-        // We should append ":00Z" or handle timezone properly. 
-        // For simplicity, let's assume local time and convert to ISO.
-        const toISO = (localStr) => new Date(localStr).toISOString();
-        
         const payload = {
             title: editForm.summary,
             notes: editForm.description,
-            start: toISO(editForm.start),
-            end: toISO(editForm.end),
+            start: localInputToISO(editForm.start),
+            end: localInputToISO(editForm.end),
         };
         const success = await onCreateEvent(payload);
         if (success) {
             handleCloseModal();
         }
     } else if (onUpdateEvent && selectedEvent) {
-        const toISO = (localStr) => new Date(localStr).toISOString();
         const payload = {
             ...editForm,
-            start: toISO(editForm.start),
-            end: toISO(editForm.end),
+            start: localInputToISO(editForm.start),
+            end: localInputToISO(editForm.end),
         };
         const success = await onUpdateEvent(selectedEvent.id, payload);
         if (success) {
@@ -145,9 +195,6 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
   };
 
   const activeMonth = currentMonth ? new Date(currentMonth) : new Date();
-  const monthStart = new Date(activeMonth.getFullYear(), activeMonth.getMonth(), 1);
-  const daysInMonth = new Date(activeMonth.getFullYear(), activeMonth.getMonth() + 1, 0).getDate();
-  const startOffset = monthStart.getDay();
 
   const getEventStart = (event) => {
     if (event?.start?.date) {
@@ -167,96 +214,76 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
     return raw ? new Date(raw) : null;
   };
 
-  const toDateKey = (date) => {
-    const year = date.getFullYear();
-    const month = String(date.getMonth() + 1).padStart(2, '0');
-    const day = String(date.getDate()).padStart(2, '0');
-    return `${year}-${month}-${day}`;
-  };
+  // Bucket events by day once per events change. Start times are parsed a single time and
+  // shared by the per-day ordering and the recent list instead of being re-parsed inside
+  // sort comparators on every render.
+  const { eventsByDay, mostRecent } = React.useMemo(() => {
+    const startTimes = new Map();
+    const byDay = {};
 
-  const isSameDay = (a, b) => a.getFullYear() === b.getFullYear() && a.getMonth() === b.getMonth() && a.getDate() === b.getDate();
+    events.forEach((event) => {
+      const start = getEventStart(event);
+      startTimes.set(event, (start && start.getTime()) || 0);
+      if (!start) return;
 
-  const eventsByDay = events.reduce((acc, event) => {
-    const start = getEventStart(event);
-    if (!start) return acc;
-
-    const isAllDay = !!event?.start?.date;
-    const end = getEventEnd(event);
-    
-    let current = new Date(start);
-    current.setHours(0,0,0,0);
-    
-    let endLimit;
-    if (end) {
-        endLimit = new Date(end);
-        if (!isAllDay) {
-            // For timed events, subtract 1ms so midnight end doesn't spill over
-            endLimit = new Date(endLimit.getTime() - 1);
-        }
-        endLimit.setHours(0,0,0,0);
-    } else {
-        endLimit = new Date(current);
-    }
+      const isAllDay = !!event?.start?.date;
+      const end = getEventEnd(event);
 
-    // Safety break to prevent infinite loops
-    let safety = 0;
-    while (current <= endLimit && safety < 365) {
-        // For all-day events, the end date from API is exclusive.
-        // If start=2023-01-01, end=2023-01-02.
-        // current=Jan 1. endLimit=Jan 2.
-        // If we use <=, we get Jan 1 and Jan 2.
-        // So for all-day, we should use < if we didn't adjust endLimit.
-        // But wait, I didn't adjust endLimit for all-day above.
-        // Let's adjust logic:
-        
-        if (isAllDay && current.getTime() === endLimit.getTime() && start.getTime() !== endLimit.getTime()) {
-             // If it's the end date of an all-day event, and it's not a single day event (start != end)
-             // Actually, single day all-day: start=Jan 1, end=Jan 2.
-             // current=Jan 1. endLimit=Jan 2.
-             // We want to stop at Jan 1.
-             break;
-        }
-        
-        const key = toDateKey(current);
-        acc[key] = acc[key] || [];
-        // Avoid duplicates if we process same event? No, reduce runs once per event.
-        acc[key].push(event);
-        
-        current.setDate(current.getDate() + 1);
-        safety++;
-    }
-    return acc;
-  }, {});
-
-  Object.values(eventsByDay).forEach(list => {
-    list.sort((a, b) => {
-      const aStart = getEventStart(a)?.getTime() || 0;
-      const bStart = getEventStart(b)?.getTime() || 0;
-      return aStart - bStart;
+      const current = new Date(start);
+      current.setHours(0,0,0,0);
+
+      let endLimit;
+      if (end) {
+          endLimit = new Date(end);
+          if (!isAllDay) {
+              // For timed events, subtract 1ms so midnight end doesn't spill over
+              endLimit = new Date(endLimit.getTime() - 1);
+          }
+          endLimit.setHours(0,0,0,0);
+      } else {
+          endLimit = new Date(current);
+      }
+
+      // Safety break to prevent infinite loops
+      let safety = 0;
+      while (current <= endLimit && safety < 365) {
+          // All-day end dates from the API are exclusive (start=Jan 1, end=Jan 2 is one day),
+          // so stop before the end date unless the event starts on it.
+          if (isAllDay && current.getTime() === endLimit.getTime() && start.getTime() !== endLimit.getTime()) {
+               break;
+          }
+
+          const key = toDateKey(current);
+          (byDay[key] = byDay[key] || []).push(event);
+
+          current.setDate(current.getDate() + 1);
+          safety++;
+      }
     });
-  });
 
-  const allEventsSorted = [...events].sort((a, b) => {
-    const aStart = getEventStart(a)?.getTime() || 0;
-    const bStart = getEventStart(b)?.getTime() || 0;
-    return bStart - aStart; // most recent first
-  });
-  const mostRecent = allEventsSorted.slice(0, 10);
+    const byStart = (a, b) => startTimes.get(a) - startTimes.get(b);
+    Object.values(byDay).forEach(list => list.sort(byStart));
 
-  const cells = [];
-  for (let i = 0; i < startOffset; i += 1) {
-    cells.push(null);
-  }
-  for (let day = 1; day <= daysInMonth; day += 1) {
-    cells.push(new Date(activeMonth.getFullYear(), activeMonth.getMonth(), day));
-  }
-  while (cells.length % 7 !== 0) {
-    cells.push(null);
-  }
+    // most recent first
+    const recent = [...events].sort((a, b) => byStart(b, a)).slice(0, 10);
+    return { eventsByDay: byDay, mostRecent: recent };
+  }, [events]);
+
+  const cells = getMonthCells(activeMonth.getFullYear(), activeMonth.getMonth());
+  const todayKey = toDateKey(new Date());
+
+  // One click handler for the whole grid: chips carry their day key and slot index, so no
+  // per-chip closure is created on each render.
+  const handleGridClick = (e) => {
+    const chip = e.target.closest('[data-event-slot]');
+    if (!chip) return;
+    const event = (eventsByDay[chip.dataset.day] || [])[Number(chip.dataset.eventSlot)];
+    if (event) handleEventClick(event);
+  };
 
   const monthLabel = i18n.currentLang === 'zh' 
     ? `${activeMonth.getFullYear()}${t('common.year')} ${activeMonth.getMonth() + 1}${t('common.month')}`
-    : activeMonth.toLocaleDateString('en-US', { year: 'numeric', month: 'long' });
+    : MONTH_LABEL_FORMAT.format(activeMonth);
 
   const formatRange = (event) => {
     const start = event?.start?.dateTime;
@@ -266,7 +293,7 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
     }
     const startDate = new Date(start);
     const endDate = new Date(end);
-    return `${startDate.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })} - ${endDate.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })}`;
+    return `${EVENT_TIME_FORMAT.format(startDate)} - ${EVENT_TIME_FORMAT.format(endDate)}`;
   };
 
   const formatDayBadge = (event) => {
@@ -276,7 +303,7 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
     }
     return i18n.currentLang === 'zh' 
       ? `${start.getMonth() + 1}${t('common.month')}${start.getDate()}日`
-      : start.toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
+      : DAY_BADGE_FORMAT.format(start);
   };
 
   return (
@@ -312,31 +339,32 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
             <div style={{color:'#2563eb', fontWeight:600}}>{t('calendar.loading')}</div>
           </div>
         )}
-        <div style={{display:'grid',gridTemplateColumns:'repeat(7,1fr)',gap:8}}>
-          {cells.map((cellDate, idx) => {
-            if (!cellDate) {
-              return <div key={`empty-${idx}`} />;
+        <div onClick={handleGridClick} style={{display:'grid',gridTemplateColumns:'repeat(7,1fr)',gap:8}}>
+          {cells.map((cell, idx) => {
+            // Cells are keyed by grid slot, not by date, so month navigation updates the
+            // existing day cells in place instead of unmounting and rebuilding all of them.
+            if (!cell) {
+              return <div key={idx} />;
             }
-            const key = toDateKey(cellDate);
+            const { key, day } = cell;
             const dayEvents = eventsByDay[key] || [];
             const hasEvents = dayEvents.length > 0;
-            const today = isSameDay(cellDate, new Date());
-            const cellBackground = today ? '#dbeafe' : hasEvents ? '#eef2ff' : '#f8fafc';
-            const borderColor = today ? '#2563eb' : hasEvents ? '#94a3b8' : '#eef2f7';
+            const today = key === todayKey;
+            const cellStyle = today ? DAY_CELL_TODAY_STYLE : hasEvents ? DAY_CELL_BUSY_STYLE : DAY_CELL_EMPTY_STYLE;
             return (
-              <div key={key} style={{minHeight:120,border:`1px solid ${borderColor}`,borderRadius:12,padding:10,textAlign:'left',background:cellBackground,display:'flex',flexDirection:'column',gap:6}}>
-                <div style={{display:'flex',justifyContent:'space-between',alignItems:'center'}}>
-                  <div style={{fontWeight:700,color:'#0f172a'}}>{cellDate.getDate()}</div>
-                  {today && <span style={{fontSize:11,color:'#2563eb',fontWeight:600}}>{t('calendar.today')}</span>}
+              <div key={idx} style={cellStyle}>
+                <div style={DAY_HEADER_STYLE}>
+                  <div style={DAY_NUMBER_STYLE}>{day}</div>
+                  {today && <span style={DAY_TODAY_BADGE_STYLE}>{t('calendar.today')}</span>}
                 </div>
-                <div style={{flex:1,display:'flex',flexDirection:'column',gap:4}}>
-                  {dayEvents.slice(0,2).map(evt => (
-                    <div key={(evt.id || evt.summary) + key} onClick={() => handleEventClick(evt)} style={{cursor:'pointer',fontSize:11,color:'#1e1b4b',padding:'3px 6px',borderRadius:999,background:'#c7d2fe',whiteSpace:'nowrap',overflow:'hidden',textOverflow:'ellipsis'}}>
+                <div style={DAY_EVENTS_STYLE}>
+                  {dayEvents.slice(0,2).map((evt, slot) => (
+                    <div key={(evt.id || evt.summary) + key} data-day={key} data-event-slot={slot} style={EVENT_CHIP_STYLE}>
                       {evt.summary || t('calendar.unnamed')}
                     </div>
                   ))}
-                  {dayEvents.length === 0 && <div style={{fontSize:11,color:'#94a3b8'}}>{t('calendar.noEvents')}</div>}
-                  {dayEvents.length > 2 && <div style={{fontSize:11,color:'#4c1d95'}}>+{dayEvents.length - 2} {t('calendar.moreEvents')}</div>}
+                  {dayEvents.length === 0 && <div style={DAY_NO_EVENTS_STYLE}>{t('calendar.noEvents')}</div>}
+                  {dayEvents.length > 2 && <div style={DAY_MORE_EVENTS_STYLE}>+{dayEvents.length - 2} {t('calendar.moreEvents')}</div>}
                 </div>
               </div>
             );
@@ -357,8 +385,8 @@ const CalendarView = ({ events = [], loading, error, currentMonth, onMonthChange
               const formatProposalDate = () => {
                 if (!startDate) return t('calendar.dateTBD');
                 return i18n.currentLang === 'zh'
-                  ? `${startDate.getMonth() + 1}${t('common.month')}${startDate.getDate()}日 ${startDate.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })}`
-                  : startDate.toLocaleDateString('en-US', { month: 'short', day: 'numeric', hour: '2-digit', minute: '2-digit' });
+                  ? `${startDate.getMonth() + 1}${t('common.month')}${startDate.getDate()}日 ${EVENT_TIME_FORMAT.format(startDate)}`
+                  : PROPOSAL_DATE_FORMAT.format(startDate);
               };
               return (
                 <div key={proposal.id} style={{background:'#fff',padding:14,borderRadius:12,border:'1px solid #fde68a'}}>
@@ -12,6 +12,22 @@ const getFolderDisplay = (t) => [
   { key: 'trash', label: t('email.trash') },
 ];
 
+// Proposal card styles are shared by every card instead of being rebuilt per card per render.
+const PROPOSAL_CARD_STYLE = { border: '1px solid #ddd', padding: 12, borderRadius: 6, marginBottom: 8 };
+const PROPOSAL_BUTTON_STYLE = {
+  marginTop: 8,
+  padding: '6px 10px',
+  display: 'flex',
+  alignItems: 'center',
+  gap: 6,
+  background: '#1f6feb',
+  color: '#fff',
+  border: 'none',
+  borderRadius: 4,
+  cursor: 'pointer',
+};
+const PROPOSAL_BUTTON_ADDED_STYLE = { ...PROPOSAL_BUTTON_STYLE, background: '#9ca3af', cursor: 'not-allowed' };
+
 const Spinner = () => (
   <div
     style={{
@@ -126,6 +142,7 @@ function EmailView({
   activeFolder,
   onFolderChange,
   onRefresh,
+  onCalendarChanged,
 }) {
   const { t } = useTranslation();
   const FOLDER_DISPLAY = getFolderDisplay(t);
@@ -203,8 +220,18 @@ function EmailView({
     return entry?.label || activeFolder;
   }, [activeFolder, t]);
 
-  const displayEmails = derivedEmails.slice(0, perPage);
-  const isEmpty = !loading && displayEmails.length === 0;
+  // Row keys and date labels are computed once per list change rather than on every render
+  // (typing in the reply box re-renders this whole view).
+  const displayRows = useMemo(
+    () =>
+      derivedEmails.slice(0, perPage).map((e) => ({
+        email: e,
+        key: e.id || e.message_id || e.mid,
+        dateLabel: new Date(e.received || Date.now()).toLocaleDateString(),
+      })),
+    [derivedEmails, perPage]
+  );
+  const isEmpty = !loading && displayRows.length === 0;
 
   const [viewingEmail, setViewingEmail] = useState(selectedEmail || null);
   const latestViewingIdRef = useRef(viewingEmail?.id || null);
@@ -220,6 +247,40 @@ function EmailView({
   const [draftReplyStatus, setDraftReplyStatus] = useState(null);
   const [editedDraftBody, setEditedDraftBody] = useState('');
 
+  // Folder listings only include headers and snippet; fetch the full body when an email is opened.
+  const emailDetailCacheRef = useRef({});
+  useEffect(() => {
+    const emailId = viewingEmail?.id;
+    if (!emailId || viewingEmail.body || viewingEmail.detailLoaded) return;
+
+    const cached = emailDetailCacheRef.current[emailId];
+    if (cached) {
+      setViewingEmail((prev) => (prev?.id === emailId ? { ...prev, ...cached, detailLoaded: true } : prev));
+      return;
+    }
+
+    let cancelled = false;
+    (async () => {
+      try {
+        const res = await fetch(`/emails/${encodeURIComponent(emailId)}`);
+        if (!res.ok) throw new Error('Email detail request failed');
+        const detail = await res.json();
+        emailDetailCacheRef.current[emailId] = detail;
+        if (!cancelled && latestViewingIdRef.current === emailId) {
+          setViewingEmail((prev) => (prev?.id === emailId ? { ...prev, ...detail, detailLoaded: true } : prev));
+        }
+      } catch (err) {
+        console.warn('Failed to load email body', err);
+        if (!cancelled && latestViewingIdRef.current === emailId) {
+          setViewingEmail((prev) => (prev?.id === emailId ? { ...prev, detailLoaded: true } : prev));
+        }
+      }
+    })();
+    return () => {
+      cancelled = true;
+    };
+  }, [viewingEmail]);
+
   useEffect(() => {
     setViewingEmail(selectedEmail || null);
     setSummary(null);
@@ -275,6 +336,7 @@ const handleAddToCalendar = async (proposal, idx) => {
     });
     if (res.ok) {
       setProposalStatuses((prev) => ({ ...prev, [idx]: "Added ✓" }));
+      if (onCalendarChanged) onCalendarChanged();
     } else {
       setProposalStatuses((prev) => ({ ...prev, [idx]: "Failed ✗" }));
     }
@@ -378,9 +440,9 @@ const handleAddToCalendar = async (proposal, idx) => {
           ) : isEmpty ? (
             <p>{t('email.noEmails')}</p>
           ) : (
-            displayEmails.map((e) => (
+            displayRows.map(({ email: e, key, dateLabel }) => (
               <div
-                key={e.id || e.message_id || e.mid}
+                key={key}
                 style={{ padding: 10, borderBottom: '1px solid #f1f5f9', cursor: 'pointer' }}
                 onClick={() => {
                   onSelectEmail && onSelectEmail(e);
@@ -390,7 +452,7 @@ const handleAddToCalendar = async (proposal, idx) => {
                 <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
                   <strong style={{ fontSize: 14 }}>{e.subject || t('email.noSubject')}</strong>
                   <span style={{ fontSize: 12, color: '#94a3b8' }}>
-                    {new Date(e.received || Date.now()).toLocaleDateString()}
+                    {dateLabel}
                   </span>
                 </div>
                 <div style={{ fontSize: 12, color: '#666' }}>{e.from}</div>
@@ -496,33 +558,26 @@ const handleAddToCalendar = async (proposal, idx) => {
               {proposals.length > 0 && (
                 <div style={{ marginTop: 16 }}>
                   <h3>Proposals</h3>
-                  {proposals.map((p, idx) => (
-                    <div key={idx} style={{ border: '1px solid #ddd', padding: 12, borderRadius: 6, marginBottom: 8 }}>
-                      <p><strong>{p.title}</strong></p>
-                      <p>{new Date(p.start).toLocaleString()} - {new Date(p.end).toLocaleString()}</p>
-                      {p.location && <p> {p.location}</p>}
-                      {p.notes && <p> {p.notes}</p>}
-                      <button
-                        onClick={() => handleAddToCalendar(p, idx)}
-                        style={{
-                          disabled: proposalStatuses[idx] === "Added ✓", // Disable when added
-                          marginTop: 8,
-                          padding: '6px 10px',
-                          display: "flex",
-                          alignItems: "center",
-                          gap: 6,
-                          background: proposalStatuses[idx] === "Added ✓" ? "#9ca3af" : "#1f6feb", // gray if added
-                          color: "#fff",
-                          border: "none",
-                          borderRadius: 4,
-                          cursor: proposalStatuses[idx] === "Added ✓" ? "not-allowed" : "pointer",
-                        }}
-                      >
-                        {proposalStatuses[idx] === "Adding..." && <Spinner />}
-                        {proposalStatuses[idx] || "Add to Calendar"}
-                      </button>
-                    </div>
-                  ))}
+                  {proposals.map((p, idx) => {
+                    const status = proposalStatuses[idx];
+                    const added = status === "Added ✓";
+                    return (
+                      <div key={idx} style={PROPOSAL_CARD_STYLE}>
+                        <p><strong>{p.title}</strong></p>
+                        <p>{new Date(p.start).toLocaleString()} - {new Date(p.end).toLocaleString()}</p>
+                        {p.location && <p> {p.location}</p>}
+                        {p.notes && <p> {p.notes}</p>}
+                        <button
+                          onClick={() => handleAddToCalendar(p, idx)}
+                          disabled={added} // Disable when added
+                          style={added ? PROPOSAL_BUTTON_ADDED_STYLE : PROPOSAL_BUTTON_STYLE}
+                        >
+                          {status === "Adding..." && <Spinner />}
+                          {status || "Add to Calendar"}
+                        </button>
+                      </div>
+                    );
+                  })}
                 </div>
               )}
               {draftReply && (
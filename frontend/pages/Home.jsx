@@ -36,9 +36,19 @@ const HomeView = () => {
     };
 
     fetchStatus();
-    // Refresh every 30 seconds
-    const interval = setInterval(fetchStatus, 30000);
-    return () => clearInterval(interval);
+    // Refresh every 30 seconds while the tab is visible; a hidden tab skips its polls and
+    // catches up once as soon as it is shown again.
+    const interval = setInterval(() => {
+      if (!document.hidden) fetchStatus();
+    }, 30000);
+    const handleVisibilityChange = () => {
+      if (!document.hidden) fetchStatus();
+    };
+    document.addEventListener('visibilitychange', handleVisibilityChange);
+    return () => {
+      clearInterval(interval);
+      document.removeEventListener('visibilitychange', handleVisibilityChange);
+    };
   }, []);
 
   const formatTimestamp = (ts) => {
@@ -2,12 +2,14 @@ import os
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
 import asyncio
+import heapq
 import logging
 import calendar as cal
+import queue
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import re
-from threading import Lock
+from threading import Lock, Thread
 import time
 import uuid
 from fastapi.staticfiles import StaticFiles
@@ -15,15 +17,16 @@ from fastapi.staticfiles import StaticFiles
 from fastapi import FastAPI, Depends, HTTPException
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.requests import Request
-from starlette.responses import FileResponse, JSONResponse, RedirectResponse
+from starlette.responses import FileResponse, JSONResponse, RedirectResponse, Response
 from google.oauth2.credentials import Credentials
 from llm_email_app.auth.session import login, auth_callback, get_credentials, load_persisted_credentials
 from llm_email_app.config import settings, BASE_DIR
-from llm_email_app.email.gmail_client import GmailClient, canonical_folder_key
-from llm_email_app.calendar.gcal import GCalClient
+from llm_email_app.email.gmail_client import GmailClient, _account_key, canonical_folder_key
+from llm_email_app.calendar.gcal import EVENT_LIST_FIELDS, GCalClient
 from typing import Dict, Any, List, Optional, Tuple
 from llm_email_app.auth.google_oauth import TOKEN_DIR
 import json
+from collections import OrderedDict
 
 from llm_email_app.llm.openai_client import OpenAIClient
 from llm_email_app.email.rules import RuleManager, ProcessedEmailStore
@@ -38,7 +41,7 @@ EMAIL_CACHE_PATH = TMP_DIR / 'emails_recent.json'
 CALENDAR_CACHE_PATH = TMP_DIR / 'calendar_recent.json'
 AUTOMATION_LOGS_PATH = TMP_DIR / 'automation_logs.json'
 PROPOSALS_CACHE_PATH = TMP_DIR / 'proposals.json'
-PROPOSALS_PROCESSED_PATH = TMP_DIR / 'proposals_processed.json'
+PROPOSALS_PROCESSED_PATH = TMP_DIR / 'proposals_processed.db'
 AUTOMATION_SETTINGS_PATH = TMP_DIR / 'automation_settings.json'
 MESSAGE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{6,256}$")
 LOG_RETENTION_DAYS = 7
@@ -49,6 +52,10 @@ PROCESSED_STORE = ProcessedEmailStore(settings.AUTO_LABEL_PROCESSED_PATH)
 PROPOSALS_PROCESSED_STORE = ProcessedEmailStore(PROPOSALS_PROCESSED_PATH, max_age_days=14, max_entries=500)
 AUTOMATION_STATUS_LOCK = Lock()
 AUTOMATION_LOG_MAX = 50
+# Cap on persisted log entries; every append re-reads and rewrites the file, so it must stay small
+# even when a busy automation run logs thousands of lines inside the retention window.
+AUTOMATION_LOG_PERSIST_MAX = 1000
+AUTOMATION_LOG_TRIM_CHUNK = 100
 EMAIL_CACHE_MAX_AGE = timedelta(minutes=90)
 AUTOMATION_STATUS: Dict[str, Any] = {
     'last_run_at': None,
@@ -58,6 +65,16 @@ AUTOMATION_STATUS: Dict[str, Any] = {
     'logs': [],
 }
 LLM_CLIENT = OpenAIClient()
+# Summaries of on-demand /summarize requests, keyed by (account, message id) so a session only
+# ever sees summaries of its own mailbox (message content never changes).
+SUMMARY_CACHE_SIZE = 128
+SUMMARY_CACHE: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+SUMMARY_CACHE_LOCK = Lock()
+# Stale ±1 year calendar snapshots are rebuilt by one long-lived worker instead of on the
+# request path; the single-slot queue coalesces refresh requests that arrive meanwhile.
+CALENDAR_SNAPSHOT_QUEUE: "queue.Queue[GCalClient]" = queue.Queue(maxsize=1)
+CALENDAR_SNAPSHOT_WORKER: Optional[Thread] = None
+CALENDAR_SNAPSHOT_WORKER_LOCK = Lock()
 
 # MCP Chat handlers storage (per-session)
 MCP_CHAT_HANDLERS: Dict[str, MCPChatHandler] = {}
@@ -141,12 +158,10 @@ def _load_cached_recent_emails(lookback_days: int, limit: int) -> List[Dict[str,
     if not ordered:
         return []
 
-    ordered.sort(
-        key=lambda pair: pair[0] or datetime.min.replace(tzinfo=timezone.utc),
-        reverse=True,
-    )
-    sliced = [item for _, item in ordered[:max(1, limit)]]
-    return sliced
+    # Only the newest `limit` entries are needed, so select them without sorting the rest.
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    newest = heapq.nlargest(max(1, limit), ordered, key=lambda pair: pair[0] or oldest)
+    return [item for _, item in newest]
 
 
 def _persist_recent_emails(mailbox: Dict[str, Any], window_days: int = 14) -> None:
@@ -171,13 +186,20 @@ def _persist_recent_emails(mailbox: Dict[str, Any], window_days: int = 14) -> No
 
 def _persist_calendar(events: List[Dict[str, Any]], window_days: int = 365) -> None:
     cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
+    cutoff_day = cutoff.date().isoformat()
     filtered: List[Dict[str, Any]] = []
     todos: List[Dict[str, Any]] = []
     for event in events:
         start = event.get('start', {}) or {}
-        start_raw = start.get('dateTime') or start.get('date')
-        start_dt = _coerce_datetime(start_raw)
-        if start_dt is None or start_dt >= cutoff:
+        if start.get('dateTime'):
+            start_dt = _coerce_datetime(start['dateTime'])
+            keep = start_dt is None or start_dt >= cutoff
+        elif start.get('date'):
+            # All-day starts are plain YYYY-MM-DD (UTC midnight here), which order correctly as strings.
+            keep = start['date'] > cutoff_day
+        else:
+            keep = True
+        if keep:
             filtered.append(event)
             summary = (event.get('summary') or '').lower()
             if event.get('eventType') == 'task' or 'todo' in summary:
@@ -208,6 +230,39 @@ def _calendar_snapshot_is_stale(max_age: timedelta = timedelta(minutes=30)) -> b
         return True
 
 
+def _calendar_snapshot_loop() -> None:
+    while True:
+        gcal_client = CALENDAR_SNAPSHOT_QUEUE.get()
+        try:
+            # An earlier queued refresh may already have rebuilt the snapshot.
+            if _calendar_snapshot_is_stale():
+                now = datetime.now(timezone.utc)
+                events = gcal_client.list_events(
+                    max_results=500,
+                    time_min=(now - timedelta(days=365)).isoformat(),
+                    time_max=(now + timedelta(days=365)).isoformat(),
+                    fields=EVENT_LIST_FIELDS,
+                )
+                _persist_calendar(events, window_days=365)
+        except Exception as exc:
+            logger.warning('Calendar snapshot refresh failed: %s', exc)
+        finally:
+            CALENDAR_SNAPSHOT_QUEUE.task_done()
+
+
+def _request_calendar_snapshot_refresh(gcal_client: GCalClient) -> None:
+    """Queue a snapshot rebuild on the calendar worker; no-op if one is already pending."""
+    global CALENDAR_SNAPSHOT_WORKER
+    with CALENDAR_SNAPSHOT_WORKER_LOCK:
+        if CALENDAR_SNAPSHOT_WORKER is None:
+            CALENDAR_SNAPSHOT_WORKER = Thread(target=_calendar_snapshot_loop, name='calendar-snapshot', daemon=True)
+            CALENDAR_SNAPSHOT_WORKER.start()
+    try:
+        CALENDAR_SNAPSHOT_QUEUE.put_nowait(gcal_client)
+    except queue.Full:
+        pass
+
+
 def _month_bounds(month_str: str) -> Tuple[datetime, datetime]:
     try:
         year, month = map(int, month_str.split('-'))
@@ -288,6 +343,10 @@ def _append_automation_log(message: str, level: str = 'info') -> None:
         # Load existing persisted logs and append new entry
         logs = _load_persisted_logs()
         logs.append(entry)
+        if len(logs) > AUTOMATION_LOG_PERSIST_MAX:
+            # Drop the oldest entries in one slice with some headroom, so trimming does not
+            # happen on every append once the cap is reached.
+            del logs[:len(logs) - AUTOMATION_LOG_PERSIST_MAX + AUTOMATION_LOG_TRIM_CHUNK]
         # Keep in-memory copy for status snapshot
         AUTOMATION_STATUS['logs'] = logs[-AUTOMATION_LOG_MAX:]
         # Persist all logs (within retention period)
@@ -434,8 +493,7 @@ def _require_credentials(request: Request) -> Dict[str, Any]:
 
 
 def _auto_label_recent_emails(gmail_client: GmailClient) -> int:
-    rules_state = RULE_MANAGER.get_state()
-    rules = rules_state.get('rules', [])
+    rules = RULE_MANAGER.rule_views()
     if not rules:
         return 0
 
@@ -450,8 +508,11 @@ def _auto_label_recent_emails(gmail_client: GmailClient) -> int:
     if used_cache:
         _append_automation_log(f"自动化使用本地缓存，共 {len(candidates)} 封候选邮件。")
     else:
-        # fetch extra to account for already-processed entries
-        candidates = gmail_client.fetch_emails_since(days=lookback_days, max_results=candidate_limit)
+        # fetch extra to account for already-processed entries; headers only, since bodies are
+        # loaded below just for the unprocessed messages that actually get evaluated
+        candidates = gmail_client.fetch_emails_since(
+            days=lookback_days, max_results=candidate_limit, metadata_only=True
+        )
 
     if not candidates:
         _append_automation_log('自动化跳过：没有可用的缓存邮件，也无法从远程获取。', level='warning')
@@ -590,10 +651,14 @@ def _extract_proposals_from_emails(gmail_client: GmailClient, gcal_client: Optio
         return 0
     
     proposals_added = 0
-    emails_checked = 0
+    # (proposal entry id, title, event body) queued for one batched calendar insert at the end
+    pending_events: List[Tuple[str, str, Dict[str, Any]]] = []
+    # (message id, subject) of the emails sent to the LLM this cycle, with their summarize arguments
+    jobs: List[Tuple[str, str]] = []
+    job_kwargs: List[Dict[str, Any]] = []
     
     for email_payload in candidates:
-        if emails_checked >= batch_limit:
+        if len(jobs) >= batch_limit:
             break
             
         message_id = email_payload.get('id')
@@ -618,20 +683,21 @@ def _extract_proposals_from_emails(gmail_client: GmailClient, gcal_client: Optio
             PROPOSALS_PROCESSED_STORE.mark_processed(message_id)
             continue
         
-        emails_checked += 1
-        
-        # Use LLM to summarize and extract proposals
-        try:
-            result = LLM_CLIENT.summarize_email(
-                email_body=body,
-                email_sender=sender,
-                email_received_time=received,
-            )
-        except Exception as exc:
-            logger.warning('LLM summarization failed for %s: %s', message_id, exc)
-            _append_automation_log(f"日程提取失败（{subject[:30] if subject else message_id}）：{exc}", level='error')
-            if delay_seconds:
-                time.sleep(delay_seconds)
+        jobs.append((message_id, subject))
+        job_kwargs.append({
+            'email_body': body,
+            'email_sender': sender,
+            'email_received_time': received,
+        })
+    
+    # Use LLM to summarize and extract proposals. The summaries are independent, so they run
+    # concurrently unless a request interval is configured to respect provider rate limits.
+    results = LLM_CLIENT.summarize_many(job_kwargs, concurrency=batch_limit, interval_seconds=delay_seconds)
+    
+    for (message_id, subject), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            logger.warning('LLM summarization failed for %s: %s', message_id, result)
+            _append_automation_log(f"日程提取失败（{subject[:30] if subject else message_id}）：{result}", level='error')
             continue
         
         # Mark as processed regardless of whether proposals were found
@@ -642,8 +708,6 @@ def _extract_proposals_from_emails(gmail_client: GmailClient, gcal_client: Optio
         
         if not event_proposals:
             _append_automation_log(f"邮件「{subject[:40] if subject else message_id}」无日程提案")
-            if delay_seconds:
-                time.sleep(delay_seconds)
             continue
         
         # Add proposals
@@ -660,28 +724,30 @@ def _extract_proposals_from_emails(gmail_client: GmailClient, gcal_client: Optio
             proposals_added += 1
             _append_automation_log(f"提取日程提案「{proposal.get('title', '')}」来自邮件「{subject[:40]}」")
             
-            # If auto_add_events is enabled, create the event immediately
+            # If auto_add_events is enabled, queue the event for the batched insert below
             if auto_add_events and gcal_client and gcal_client.service:
-                try:
-                    event_data = {
-                        'title': proposal.get('title', ''),
-                        'start': proposal.get('start', ''),
-                        'end': proposal.get('end', ''),
-                        'location': proposal.get('location', ''),
-                        'notes': proposal.get('notes', '') + f"\n\n来自邮件：{subject}",
-                    }
-                    event_id = gcal_client.create_event(event_data)
-                    if event_id:
-                        _update_proposal_status(entry['id'], 'accepted')
-                        _append_automation_log(f"自动添加日程「{proposal.get('title', '')}」到日历")
-                except Exception as exc:
-                    logger.warning('Failed to auto-create event: %s', exc)
-        
-        if delay_seconds:
-            time.sleep(delay_seconds)
+                event_data = {
+                    'title': proposal.get('title', ''),
+                    'start': proposal.get('start', ''),
+                    'end': proposal.get('end', ''),
+                    'location': proposal.get('location', ''),
+                    'notes': proposal.get('notes', '') + f"\n\n来自邮件：{subject}",
+                }
+                pending_events.append((entry['id'], proposal.get('title', ''), event_data))
+    
+    if pending_events:
+        try:
+            event_ids = gcal_client.create_events([event_data for _, _, event_data in pending_events])
+        except Exception as exc:
+            logger.warning('Failed to auto-create events: %s', exc)
+            event_ids = []
+        for (entry_id, title, _), event_id in zip(pending_events, event_ids):
+            if event_id:
+                _update_proposal_status(entry_id, 'accepted')
+                _append_automation_log(f"自动添加日程「{title}」到日历")
     
-    if emails_checked > 0:
-        _append_automation_log(f"日程提取完成：检查 {emails_checked} 封邮件，提取 {proposals_added} 个提案")
+    if jobs:
+        _append_automation_log(f"日程提取完成：检查 {len(jobs)} 封邮件，提取 {proposals_added} 个提案")
     
     return proposals_added
 
@@ -711,7 +777,7 @@ def _run_background_cycle() -> None:
         logger.warning('Background email refresh failed: %s', exc)
 
     try:
-        events = gcal_client.list_events(max_results=500)
+        events = gcal_client.list_events(max_results=500, fields=EVENT_LIST_FIELDS)
         _persist_calendar(events, window_days=365)
     except Exception as exc:
         logger.warning('Background calendar refresh failed: %s', exc)
@@ -760,6 +826,7 @@ async def _shutdown_background_workers() -> None:
         stop_event.set()
     if task:
         await task
+    LLM_CLIENT.close()
 
 # Serve frontend from project root (not src/)
 PROJECT_ROOT = Path(__file__).resolve().parents[2]  # -> project root
@@ -837,10 +904,9 @@ def get_gcal_client(request: Request) -> GCalClient:
 def get_automation_status(request: Request):
     _require_credentials(request)
     status = _automation_status_snapshot()
-    rules_state = RULE_MANAGER.get_state()
     status.update({
-        'automation_enabled': rules_state['automation_enabled'],
-        'rule_count': len(rules_state['rules']),
+        'automation_enabled': RULE_MANAGER.automation_enabled(),
+        'rule_count': len(RULE_MANAGER.rule_views()),
     })
     return status
 
@@ -856,9 +922,8 @@ def get_automation_logs(request: Request, days: int = 7, limit: int = 100):
         log for log in all_logs
         if _coerce_datetime(log.get('timestamp')) and _coerce_datetime(log.get('timestamp')) >= cutoff
     ]
-    # Sort by timestamp descending (most recent first)
-    filtered.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-    capped = filtered[:max(1, min(limit, 500))]
+    # Most recent first; only the capped page is ordered.
+    capped = heapq.nlargest(max(1, min(limit, 500)), filtered, key=lambda x: x.get('timestamp', ''))
     return {
         'logs': capped,
         'total': len(filtered),
@@ -984,7 +1049,7 @@ def update_extra_automation_settings(payload: Dict[str, Any], request: Request):
 @app.get('/automation/rules', response_model=Dict[str, Any])
 def list_automation_rules(request: Request):
     _require_credentials(request)
-    return RULE_MANAGER.get_state()
+    return Response(content=RULE_MANAGER.state_json(), media_type='application/json')
 
 
 @app.post('/automation/run', response_model=Dict[str, Any])
@@ -1038,7 +1103,7 @@ def delete_automation_rule(
     removed = RULE_MANAGER.delete_rule(rule_id)
     if not removed:
         raise HTTPException(status_code=404, detail='Rule not found')
-    label_name = target.get('label') if isinstance(target, dict) else rule_id
+    label_name = target.get('label') if target is not None else rule_id
     _append_automation_log(f"删除规则「{label_name or rule_id}」")
     _reset_processed_email_cache('删除规则')
     _trigger_automation_run(gmail_client, context='rule_deleted', gcal_client=gcal_client)
@@ -1055,13 +1120,13 @@ def update_automation_settings(
     _require_credentials(request)
     enabled = bool(payload.get('automation_enabled'))
     was_enabled = RULE_MANAGER.automation_enabled()
-    state = RULE_MANAGER.set_automation_enabled(enabled)
+    RULE_MANAGER.set_automation_enabled(enabled)
     _append_automation_log(f"自动化现已{'开启' if enabled else '关闭'}")
     if enabled:
         if not was_enabled:
             _reset_processed_email_cache('自动化开启')
         _trigger_automation_run(gmail_client, context='automation_enabled', gcal_client=gcal_client)
-    return state
+    return Response(content=RULE_MANAGER.state_json(), media_type='application/json')
 
 @app.get("/")
 def read_root():
@@ -1103,6 +1168,15 @@ def search_emails(q: str, gmail_client: GmailClient = Depends(get_gmail_client))
     # We will implement this later.
     return []
 
+@app.get("/emails/{message_id}", response_model=Dict[str, Any])
+def get_email(message_id: str, gmail_client: GmailClient = Depends(get_gmail_client)):
+    # List views carry headers/snippet only; the full body is loaded here when an email is opened.
+    safe_message_id = _validate_message_id_or_400(message_id)
+    msg = gmail_client.get_message(safe_message_id)
+    if not msg:
+        raise HTTPException(status_code=404, detail="Email not found")
+    return msg
+
 @app.post("/emails/send")
 def send_email(email_data: Dict[str, Any], gmail_client: GmailClient = Depends(get_gmail_client)):
     return gmail_client.send_email(
@@ -1182,16 +1256,16 @@ def get_calendar_events(
         if not time_max:
             time_max = (now + timedelta(days=365)).isoformat()
 
-    events = gcal_client.list_events(max_results=max_results, time_min=time_min, time_max=time_max)
+    events = gcal_client.list_events(
+        max_results=max_results,
+        time_min=time_min,
+        time_max=time_max,
+        fields=EVENT_LIST_FIELDS,
+    )
 
     if gcal_client.service is not None:
         if _calendar_snapshot_is_stale():
-            snapshot_events = gcal_client.list_events(
-                max_results=max(max_results, 500),
-                time_min=(now - timedelta(days=365)).isoformat(),
-                time_max=(now + timedelta(days=365)).isoformat(),
-            )
-            _persist_calendar(snapshot_events, window_days=365)
+            _request_calendar_snapshot_refresh(gcal_client)
     else:
         _persist_calendar(events, window_days=365)
     return events
@@ -1305,9 +1379,32 @@ async def get_available_tools(request: Request):
     return calendar_server.get_tools() + email_server.get_tools()
 
 
+def _cached_summary(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    with SUMMARY_CACHE_LOCK:
+        cached = SUMMARY_CACHE.get(key)
+        if cached is not None:
+            SUMMARY_CACHE.move_to_end(key)
+        return cached
+
+
+def _remember_summary(key: Tuple[str, str], payload: Dict[str, Any]) -> None:
+    with SUMMARY_CACHE_LOCK:
+        SUMMARY_CACHE[key] = payload
+        SUMMARY_CACHE.move_to_end(key)
+        while len(SUMMARY_CACHE) > SUMMARY_CACHE_SIZE:
+            SUMMARY_CACHE.popitem(last=False)
+
+
 @app.post("/api/emails/{message_id}/summarize")
 def summarize_email(message_id: str, gmail_client: GmailClient = Depends(get_gmail_client)):
     safe_message_id = _validate_message_id_or_400(message_id)
+    account = _account_key(gmail_client.creds)
+    # Without an account key (stubbed client) there is nothing to scope entries by, so skip the cache.
+    cache_key = (account, safe_message_id) if account else None
+    cached = _cached_summary(cache_key) if cache_key else None
+    if cached is not None:
+        return JSONResponse(cached)
+
     # Fetch the message content
     msg = gmail_client.get_message(safe_message_id)
     if not msg:
@@ -1331,11 +1428,14 @@ def summarize_email(message_id: str, gmail_client: GmailClient = Depends(get_gma
             email_body=content,
             email_sender=email_from,
         )
-        return JSONResponse({
+        payload = {
             "summary": result.get("text", ""),
             "proposals": result.get("proposals", []),
             "draft_reply": result.get("draft_reply")
-        })
+        }
+        if cache_key:
+            _remember_summary(cache_key, payload)
+        return JSONResponse(payload)
     except Exception as exc:
         logger.exception("Summarization failed: %s", exc)
         raise HTTPException(status_code=500, detail="Summarization failed")
\ No newline at end of file
@@ -6,6 +6,7 @@ Use `google-auth-oauthlib` helpers for web or local flows.
 from typing import Any, Optional
 from pathlib import Path
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -66,3 +67,53 @@ def get_web_flow(scopes: list = None, state: Optional[str] = None) -> Any:
         state=state,
     )
     return flow
+
+
+# httplib2.Http keeps connections alive but is not thread-safe, so each thread gets its own.
+_thread_transports = threading.local()
+
+
+def _thread_http() -> Any:
+    http = getattr(_thread_transports, 'http', None)
+    if http is None:
+        import httplib2
+
+        http = httplib2.Http()
+        _thread_transports.http = http
+    return http
+
+
+class _ThreadLocalHttp:
+    """httplib2.Http stand-in that sends each request over the calling thread's own keep-alive
+    connections.
+
+    A service built on it can be used from any thread, and Gmail and Calendar clients share the
+    same pools (httplib2 keys connections by host), so a request handler that touches both APIs
+    reuses warm TLS connections instead of handshaking per client.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_thread_http(), name)
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        return _thread_http().request(*args, **kwargs)
+
+
+SHARED_HTTP = _ThreadLocalHttp()
+
+
+def authorized_http(creds: Any, user_agent: Optional[str] = None) -> Any:
+    """Return an authorized transport for `creds` on the shared keep-alive connections.
+
+    Raises ImportError when httplib2 / google-auth-httplib2 are unavailable so callers can fall
+    back to `build(..., credentials=creds)`.
+    """
+    import httplib2  # noqa: F401  (fail early, not on the first request)
+    import google_auth_httplib2
+
+    http = google_auth_httplib2.AuthorizedHttp(creds, http=SHARED_HTTP)
+    if user_agent:
+        from googleapiclient.http import set_user_agent
+
+        http = set_user_agent(http, user_agent)
+    return http
@@ -17,6 +17,13 @@ except Exception:
 
 from llm_email_app.config import settings
 
+# Calendar batch requests accept at most 50 sub-requests.
+BATCH_MAX_SIZE = 50
+
+# Partial-response selector for list views: only what the month grid, event details and the
+# cached snapshot read. Full resources (attendees, reminders, conferencing...) are several times larger.
+EVENT_LIST_FIELDS = 'items(id,summary,description,location,start,end,eventType),nextPageToken'
+
 
 class GCalClient:
     def __init__(self, creds: object = None):
@@ -30,7 +37,7 @@ class GCalClient:
             # 只有在提供了 creds 时才构建服务
             # 不自动触发 OAuth flow，应该由调用者（如 GUI）统一处理
             if self.creds:
-                self.service = build('calendar', 'v3', credentials=self.creds)
+                self.service = self._build_service()
             else:
                 # 如果没有提供 creds，不自动触发 OAuth，返回 None service（使用 stubs）
                 logger.info('No credentials provided; GCalClient will use stubbed methods')
@@ -39,6 +46,16 @@ class GCalClient:
             logger.exception('Failed to initialize Google Calendar service: %s', e)
             self.service = None
 
+    def _build_service(self):
+        """Build a Calendar service on the keep-alive transport shared with the Gmail client."""
+        try:
+            from llm_email_app.auth.google_oauth import authorized_http
+
+            http = authorized_http(self.creds)
+        except Exception:
+            return build('calendar', 'v3', credentials=self.creds)
+        return build('calendar', 'v3', http=http, cache_discovery=False)
+
     def create_event(self, proposal: Dict[str, Any]) -> str:
         """Create an event from a proposal dict and return the created event id.
 
@@ -48,7 +65,53 @@ class GCalClient:
             logger.info('GCalClient not configured; returning stub event id')
             return 'gcal-stub-event-id'
 
-        # Build event body
+        body = self._event_body(proposal)
+        try:
+            event = self.service.events().insert(calendarId='primary', body=body, sendUpdates='none').execute()
+            event_id = event.get('id')
+            logger.info('Created calendar event id=%s', event_id)
+            return event_id
+        except HttpError as e:
+            logger.exception('Failed to create calendar event: %s', e)
+            raise
+
+    def create_events(self, proposals: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create several events and return their ids in the same order as `proposals`.
+
+        The inserts are sent through Calendar batch requests (at most BATCH_MAX_SIZE per batch),
+        so N proposals cost one round-trip instead of N. A failed sub-request is logged and
+        yields None in its slot.
+        """
+        if not proposals:
+            return []
+        if self.service is None:
+            logger.info('GCalClient not configured; returning stub event ids')
+            return ['gcal-stub-event-id' for _ in proposals]
+        if len(proposals) == 1:
+            return [self.create_event(proposals[0])]
+
+        event_ids: List[Optional[str]] = [None] * len(proposals)
+
+        def _on_response(request_id: str, response: dict, exception: Optional[Exception]) -> None:
+            if exception is not None:
+                logger.warning('Failed to create calendar event #%s: %s', request_id, exception)
+                return
+            event_ids[int(request_id)] = response.get('id')
+
+        events = self.service.events()
+        for start in range(0, len(proposals), BATCH_MAX_SIZE):
+            batch = self.service.new_batch_http_request(callback=_on_response)
+            for index in range(start, min(start + BATCH_MAX_SIZE, len(proposals))):
+                body = self._event_body(proposals[index])
+                batch.add(events.insert(calendarId='primary', body=body, sendUpdates='none'), request_id=str(index))
+            batch.execute()
+
+        logger.info('Created %d/%d calendar events', sum(1 for e in event_ids if e), len(proposals))
+        return event_ids
+
+    @staticmethod
+    def _event_body(proposal: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an events().insert body from a proposal dict."""
         body: Dict[str, Any] = {
             'summary': proposal.get('title'),
             'description': proposal.get('notes') or '',
@@ -74,22 +137,22 @@ class GCalClient:
         if proposal.get('location'):
             body['location'] = proposal.get('location')
 
-        try:
-            event = self.service.events().insert(calendarId='primary', body=body, sendUpdates='none').execute()
-            event_id = event.get('id')
-            logger.info('Created calendar event id=%s', event_id)
-            return event_id
-        except HttpError as e:
-            logger.exception('Failed to create calendar event: %s', e)
-            raise
+        return body
 
-    def list_events(self, max_results: int = 50, time_min: Optional[str] = None, time_max: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_events(
+        self,
+        max_results: int = 50,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Get a list of calendar events.
         
         Args:
             max_results: The maximum number of results to return
             time_min: The start time (ISO 8601 format, optional)
             time_max: The end time (ISO 8601 format, optional)
+            fields: Partial-response selector such as EVENT_LIST_FIELDS (optional, full resources by default)
         
         Returns:
             The list of events
@@ -98,16 +161,28 @@ class GCalClient:
             logger.info('GCalClient not configured; returning empty list')
             return []
         
+        list_kwargs: Dict[str, Any] = {}
+        if fields:
+            list_kwargs['fields'] = fields
+        events: List[Dict[str, Any]] = []
         try:
-            events_result = self.service.events().list(
-                calendarId='primary',
-                maxResults=max_results,
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            events = events_result.get('items', [])
+            # Google may return a short page with a nextPageToken even when maxResults isn't
+            # reached (busy months); follow the tokens until max_results events are collected.
+            while True:
+                events_result = self.service.events().list(
+                    calendarId='primary',
+                    maxResults=max_results - len(events),
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    singleEvents=True,
+                    orderBy='startTime',
+                    **list_kwargs
+                ).execute()
+                events.extend(events_result.get('items', []))
+                page_token = events_result.get('nextPageToken')
+                if not page_token or len(events) >= max_results:
+                    break
+                list_kwargs['pageToken'] = page_token
             logger.info('Retrieved %d calendar events', len(events))
             return events
         except HttpError as e:
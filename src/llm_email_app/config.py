@@ -21,11 +21,13 @@ class Settings:
     BACKEND_PORT: int = int(os.getenv('BACKEND_PORT', '8000'))
     DRY_RUN: bool = _as_bool(os.getenv('DRY_RUN', 'true'), default=True)
     MAX_TOKEN: int = int(os.getenv('MAX_TOKEN', '5120'))
+    # Email bodies are trimmed to this many characters before summarization (0 disables the limit)
+    LLM_BODY_MAX_CHARS: int = int(os.getenv('LLM_BODY_MAX_CHARS', '6000'))
 
     # Automation / background processing knobs
     BACKGROUND_REFRESH_INTERVAL_MINUTES: int = int(os.getenv('BACKGROUND_REFRESH_INTERVAL_MINUTES', '10'))
     AUTO_LABEL_RULES_PATH: Path = Path(os.getenv('AUTO_LABEL_RULES_PATH') or (BASE_DIR / 'data' / 'rules.json'))
-    AUTO_LABEL_PROCESSED_PATH: Path = Path(os.getenv('AUTO_LABEL_PROCESSED_PATH') or (BASE_DIR / 'tmp' / 'auto_label_processed.json'))
+    AUTO_LABEL_PROCESSED_PATH: Path = Path(os.getenv('AUTO_LABEL_PROCESSED_PATH') or (BASE_DIR / 'tmp' / 'auto_label_processed.db'))
     AUTO_LABEL_ENABLED_DEFAULT: bool = _as_bool(os.getenv('AUTO_LABEL_ENABLED_DEFAULT', 'false'), default=False)
     AUTO_LABEL_LOOKBACK_DAYS: int = int(os.getenv('AUTO_LABEL_LOOKBACK_DAYS', '7'))
     AUTO_LABEL_MAX_PER_CYCLE: int = int(os.getenv('AUTO_LABEL_MAX_PER_CYCLE', '20'))
@@ -2,21 +2,29 @@
 
 Replace stubs with real Gmail API calls using googleapiclient.discovery or the Gmail REST endpoints with authorized credentials.
 """
-from typing import List, Dict, Optional, Any
-import base64
-import email as py_email
-from email.utils import parseaddr
+from typing import List, Dict, Optional, Any, Tuple
+import functools
+import hashlib
 import logging
-from datetime import datetime, timezone, timedelta
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# pybase64 (SIMD libbase64) is a drop-in, much faster codec for large message bodies.
 try:
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
+    from pybase64 import urlsafe_b64decode, urlsafe_b64encode
 except Exception:
-    build = None  # type: ignore
-    HttpError = Exception  # type: ignore
+    from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+# googleapiclient is imported on first GmailClient construction (see _load_google_api);
+# until then HttpError is a placeholder so except clauses stay valid.
+build = None  # type: ignore
+HttpError = Exception  # type: ignore
+_google_api_loaded = False
 
 from llm_email_app.config import settings
 
@@ -27,16 +35,247 @@ FOLDER_LABELS: Dict[str, str] = {
     'trash': 'TRASH',
 }
 
+# Folder keys in overview order.
+FOLDER_KEYS: Tuple[str, ...] = tuple(FOLDER_LABELS)
+
 FOLDER_ALIASES: Dict[str, str] = {
     'junk': 'trash',  # backward compatibility for legacy front-end routes
 }
 
+# Partial-response mask for messages().list(); only ids and the page cursor are read.
+LIST_FIELDS = 'messages/id,nextPageToken'
+
+# Headers requested for list views, which fetch format='metadata' (no body) per message.
+METADATA_HEADERS = ['From', 'Subject', 'Date', 'Message-ID']
+
+# Headers _parse_message_content reads; the header scan stops once all are found.
+PARSED_HEADERS = frozenset(METADATA_HEADERS)
+
+# Google APIs only gzip responses for clients whose User-Agent mentions gzip. Per-request
+# headers already do; this also covers the batch envelope sent by the transport itself.
+USER_AGENT = 'llm-email-app (gzip)'
+
+# Upper bound on memoized message parses kept per process.
+PARSE_CACHE_SIZE = 2048
+
+# Upper bound on remembered list page tokens kept per process.
+PAGE_TOKEN_CACHE_SIZE = 256
+
+# Seconds a remembered page token is trusted; new mail shifts which messages a page holds.
+PAGE_TOKEN_TTL = 300
+
+# Seconds before the labels().list() snapshot is considered stale.
+LABEL_CACHE_TTL = 300
+
+# Upper bound on accounts whose label snapshot is kept per process.
+LABEL_CACHE_ACCOUNTS = 64
+
+# Gmail rejects/throttles large batches; 50 sub-requests per batch is the documented sweet spot.
+BATCH_MAX_SIZE = 50
+
+# Failed batch sub-requests (typically per-user 429s while folders load concurrently) are
+# re-sent in smaller batches with exponential backoff before the page is given up on.
+BATCH_RETRY_ATTEMPTS = 3
+BATCH_RETRY_BACKOFF = 0.5
 
+# Sub-request statuses meaning the message no longer exists; those are skipped, not retried.
+GONE_STATUSES = frozenset({404, 410})
+
+# Deterministic mailbox contents returned when the Gmail service is unavailable (local dev).
+STUB_EMAILS: Dict[str, Tuple[Dict[str, str], ...]] = {
+    'inbox': (
+        {
+            'id': 'stub-inbox-1',
+            'from': 'alice@example.com',
+            'subject': 'Meeting request: Q4 roadmap',
+            'body': 'Hi, can we meet next Tuesday at 10am to go over the Q4 roadmap? Regards, Alice'
+        },
+        {
+            'id': 'stub-inbox-2',
+            'from': 'bob@example.com',
+            'subject': 'Quick sync',
+            'body': 'Can we do a quick sync tomorrow afternoon?'
+        },
+    ),
+    'sent': (
+        {
+            'id': 'stub-sent-1',
+            'from': 'you@example.com',
+            'subject': 'Weekly status recap',
+            'body': 'Sent over the highlights for this week—let me know if questions.'
+        },
+    ),
+    'drafts': (
+        {
+            'id': 'stub-draft-1',
+            'from': 'you@example.com',
+            'subject': 'Draft: Contract follow-up',
+            'body': 'Need to confirm pricing section before sending.'
+        },
+    ),
+    'trash': (
+        {
+            'id': 'stub-trash-1',
+            'from': 'promo@example.net',
+            'subject': 'Limited time winnings!!!',
+            'body': 'Click now to claim your prize.'
+        },
+    ),
+}
+
+
+@functools.lru_cache(maxsize=32)
 def canonical_folder_key(folder: Optional[str]) -> str:
     key = (folder or 'inbox').lower()
     return FOLDER_ALIASES.get(key, key)
 
 
+def _gmail_call(default: Any = None, reraise: bool = False):
+    """Wrap a GmailClient API method with the shared HttpError handling.
+
+    Errors are logged as a one-line warning (full traceback only at DEBUG) and then either
+    re-raised or swallowed with `default` returned.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return fn(self, *args, **kwargs)
+            except HttpError as e:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Gmail API error in %s', fn.__name__, exc_info=True)
+                else:
+                    logger.warning('Gmail API error in %s: %s', fn.__name__, e)
+                if reraise:
+                    raise
+                return default
+        return wrapper
+    return decorator
+
+
+def _new_outgoing_message():
+    """Create an EmailMessage bound to the shared SMTP policy (CRLF, RFC 2047 headers)."""
+    from email.message import EmailMessage
+    from email.policy import SMTP
+
+    return EmailMessage(policy=SMTP)
+
+
+def _encode_raw(message) -> str:
+    """Serialize a message into the base64url `raw` form expected by the Gmail API."""
+    # base64url output is pure ASCII, so the ascii codec is sufficient
+    return urlsafe_b64encode(message.as_bytes()).decode('ascii')
+
+
+def _ms_to_iso(ms: int) -> str:
+    """Format epoch milliseconds as a UTC ISO 8601 string.
+
+    Produces the same text as datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
+    without constructing a datetime.
+    """
+    seconds, millis = divmod(ms, 1000)
+    t = time.gmtime(seconds)
+    stamp = f'{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}'
+    if millis:
+        stamp += f'.{millis:03d}000'
+    return stamp + '+00:00'
+
+
+def _find_body_data(payload: Dict[str, Any]) -> Optional[str]:
+    """Return the base64url data of the first text/plain part, falling back to text/html.
+
+    Walks the MIME tree depth-first in document order, so text nested inside
+    multipart/alternative or multipart/related parts is found; attachments are skipped.
+    When no text part exists (e.g. only text/calendar or message/rfc822 leaves), the first
+    part carrying inline data is used, as the old parts[0] fallback did.
+    """
+    if not payload.get('parts'):
+        return payload.get('body', {}).get('data')
+
+    html_data = None
+    first_data = None
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        children = part.get('parts')
+        if children:
+            stack.extend(reversed(children))
+            continue
+        data = part.get('body', {}).get('data')
+        if not data:
+            continue
+        if first_data is None:
+            first_data = data
+        if part.get('filename'):
+            continue
+        mime = part.get('mimeType', '')
+        if mime == 'text/plain':
+            return data
+        if mime == 'text/html' and html_data is None:
+            html_data = data
+    return html_data or first_data
+
+
+def _account_key(creds: object) -> str:
+    """Stable key for the mailbox behind `creds`, used to share caches across request-scoped clients.
+
+    Derived from the refresh token (hashed, so the secret is not kept as a dict key); the access
+    token is only a fallback since it rotates hourly.
+    """
+    secret = getattr(creds, 'refresh_token', None) or getattr(creds, 'token', None)
+    if not secret:
+        return ''
+    return hashlib.sha256(secret.encode('utf-8')).hexdigest()[:16]
+
+
+# API handlers build a GmailClient per request, so memoized parses live at process level:
+# (account, message id, historyId, internalDate, metadata_only) -> label-independent fields.
+_parse_cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+# account -> (monotonic fetch time, id->name, name->id), shared by the per-request clients so
+# the LABEL_CACHE_TTL snapshot outlives any single request.
+_label_caches: 'OrderedDict[str, Tuple[float, Dict[str, str], Dict[str, str]]]' = OrderedDict()
+_label_caches_lock = threading.Lock()
+
+
+# (account, label id, per_page, query, page) -> (pageToken that lists that page, monotonic time)
+_page_tokens: 'OrderedDict[tuple, Tuple[str, float]]' = OrderedDict()
+_page_tokens_lock = threading.Lock()
+
+
+def _load_google_api() -> None:
+    """Import googleapiclient once, leaving `build` as None when it is not installed."""
+    global build, HttpError, _google_api_loaded
+    if _google_api_loaded:
+        return
+    _google_api_loaded = True
+    try:
+        from googleapiclient.discovery import build as _build
+        from googleapiclient.errors import HttpError as _HttpError
+    except Exception:
+        return
+    build, HttpError = _build, _HttpError
+
+
+# Overview folder fetches run on a process-wide pool so its threads (and their kept-alive
+# connections) outlive any single client.
+_overview_executor: Optional[ThreadPoolExecutor] = None
+_overview_executor_lock = threading.Lock()
+
+
+def _get_overview_executor() -> ThreadPoolExecutor:
+    global _overview_executor
+    with _overview_executor_lock:
+        if _overview_executor is None:
+            _overview_executor = ThreadPoolExecutor(
+                max_workers=2 * len(FOLDER_KEYS),
+                thread_name_prefix='gmail-overview'
+            )
+        return _overview_executor
+
+
 class GmailClient:
     """Gmail client that uses Google APIs when configured, otherwise falls back to stubs.
 
@@ -49,21 +288,36 @@ class GmailClient:
     def __init__(self, creds: object = None):
         self.creds = creds
         self.service = None
+        self._account = _account_key(creds)
         self._label_cache: Dict[str, str] = {}
-        if build is None:
-            logger.info('googleapiclient not installed; GmailClient will return stubbed emails')
-            return
-
+        self._label_ids_by_name: Dict[str, str] = {}
+        self._label_cache_ts = 0.0
+        if self._account:
+            with _label_caches_lock:
+                shared = _label_caches.get(self._account)
+            if shared is not None:
+                self._label_cache_ts, self._label_cache, self._label_ids_by_name = shared
+        # Folder snapshots are fetched concurrently. A service on the shared thread-routed
+        # transport is safe to use from any thread; only the fallback plain-credentials build
+        # (single httplib2.Http) needs one service per worker thread (see _thread_service).
+        self._thread_safe_service = False
+        self._thread_local = threading.local()
         if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
             logger.info('Google client id/secret not configured; GmailClient will return stubbed emails')
             return
 
+        _load_google_api()
+        if build is None:
+            logger.info('googleapiclient not installed; GmailClient will return stubbed emails')
+            return
+
         try:
             # 只有在提供了 creds 时才构建服务
             # 不自动触发 OAuth flow，应该由调用者（如 GUI）统一处理
             if creds:
                 self.creds = creds
-                self.service = build('gmail', 'v1', credentials=creds)
+                self.service = self._build_service()
+                self._thread_local.service = self.service
             else:
                 # 如果没有提供 creds，不自动触发 OAuth，返回 None service（使用 stubs）
                 logger.info('No credentials provided; GmailClient will return stubbed emails')
@@ -73,70 +327,126 @@ class GmailClient:
             logger.exception('Failed to initialize Gmail service; falling back to stubs: %s', e)
             self.service = None
 
+    def _build_service(self):
+        """Build a Gmail service on the keep-alive transport shared with the Calendar client.
+
+        The transport negotiates gzip-compressed responses.
+        """
+        try:
+            from llm_email_app.auth.google_oauth import authorized_http
+
+            http = authorized_http(self.creds, USER_AGENT)
+        except Exception:
+            return build('gmail', 'v1', credentials=self.creds, cache_discovery=False)
+        self._thread_safe_service = True
+        return build('gmail', 'v1', http=http, cache_discovery=False)
+
+    def _thread_service(self):
+        """Return a Gmail service that is safe to use from the calling thread."""
+        if self.creds is None or build is None or self._thread_safe_service:
+            return self.service
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            service = self._build_service()
+            self._thread_local.service = service
+        return service
+
     def _refresh_label_cache(self) -> Dict[str, str]:
-        """Fetch Gmail labels and memoize id->name lookups."""
+        """Fetch Gmail labels and memoize id->name and name->id lookups."""
         if self.service is None:
             return self._label_cache
         try:
-            labels = self.service.users().labels().list(userId='me').execute().get('labels', [])
-            self._label_cache = {
+            labels = self._thread_service().users().labels().list(userId='me').execute().get('labels', [])
+            names_by_id = {
                 label['id']: label.get('name', label['id'])
                 for label in labels
                 if label.get('id')
             }
+            self._label_ids_by_name = {name: label_id for label_id, name in names_by_id.items()}
+            self._label_cache = names_by_id
+            self._label_cache_ts = time.monotonic()
+            if self._account:
+                with _label_caches_lock:
+                    _label_caches[self._account] = (self._label_cache_ts, names_by_id, self._label_ids_by_name)
+                    _label_caches.move_to_end(self._account)
+                    if len(_label_caches) > LABEL_CACHE_ACCOUNTS:
+                        _label_caches.popitem(last=False)
         except HttpError as exc:
             logger.warning('Unable to refresh Gmail label cache: %s', exc)
         return self._label_cache
 
+    def _get_labels(self) -> Dict[str, str]:
+        """Return the id->name label map, refreshing it once it is older than LABEL_CACHE_TTL."""
+        if self._label_cache and time.monotonic() - self._label_cache_ts < LABEL_CACHE_TTL:
+            return self._label_cache
+        return self._refresh_label_cache()
+
+    def _remember_label(self, label_id: str, label_name: str) -> None:
+        # updates the shared snapshot in place, so other clients for the account see it too
+        self._label_cache[label_id] = label_name
+        self._label_ids_by_name[label_name] = label_id
+
     def _label_names_from_ids(self, label_ids: List[str]) -> List[str]:
         if not label_ids:
             return []
-        cache = self._label_cache or self._refresh_label_cache()
+        cache = self._get_labels()
         return [cache.get(label_id, label_id) for label_id in label_ids]
 
-    def _parse_message(self, msg: dict) -> Dict[str, str]:
-        """Parse a Gmail API message resource into a simple dict with id, from, subject, body."""
-        headers = {h['name']: h.get('value') for h in msg.get('payload', {}).get('headers', [])}
-        from_hdr = headers.get('From') or headers.get('From:') or ''
+    def _parse_message(self, msg: dict, metadata_only: bool = False) -> Dict[str, str]:
+        """Parse a Gmail API message resource into a simple dict with id, from, subject, body.
+
+        `from`, `subject` and `body` are always strings (empty when absent), so callers can
+        index them directly instead of re-normalizing every field.
+
+        Header/body parsing is memoized process-wide per (account, id, historyId, internalDate),
+        so it is shared by the per-request clients; labels are resolved on every call because
+        they change. When `metadata_only` is set the resource was fetched with
+        format='metadata' and `body` is left empty.
+        """
+        key = (
+            self._account,
+            msg.get('id'),
+            msg.get('historyId'),
+            msg.get('internalDate') or msg.get('internal_date'),
+            metadata_only,
+        )
+        with _parse_cache_lock:
+            parsed = _parse_cache.get(key) if key[1] else None
+            if parsed is not None:
+                _parse_cache.move_to_end(key)
+        if parsed is None:
+            parsed = self._parse_message_content(msg, metadata_only)
+            if key[1]:
+                with _parse_cache_lock:
+                    _parse_cache[key] = parsed
+                    if len(_parse_cache) > PARSE_CACHE_SIZE:
+                        _parse_cache.popitem(last=False)
+
+        label_ids = msg.get('labelIds') or []
+        return {
+            **parsed,
+            'label_ids': label_ids,
+            'labels': self._label_names_from_ids(label_ids),
+        }
+
+    def _parse_message_content(self, msg: dict, metadata_only: bool = False) -> Dict[str, Any]:
+        """Extract id, from, subject, body, snippet and received from a message resource."""
+        headers: Dict[str, Optional[str]] = {}
+        for header in msg.get('payload', {}).get('headers', ()):
+            name = header.get('name')
+            if name in PARSED_HEADERS:
+                headers[name] = header.get('value')
+                if len(headers) == len(PARSED_HEADERS):
+                    break
+        from_hdr = headers.get('From') or ''
         subject = headers.get('Subject') or ''
         snippet = msg.get('snippet', '')
 
         body = ''
-        payload = msg.get('payload', {})
-        if 'parts' in payload:
-            # walk parts to find text/plain
-            for part in payload.get('parts', []):
-                mime = part.get('mimeType', '')
-                if mime == 'text/plain':
-                    data = part.get('body', {}).get('data')
-                    if data:
-                        body = base64.urlsafe_b64decode(data.encode('utf-8')).decode('utf-8', errors='replace')
-                        break
-                # fallback to first part
-            if not body:
-                # try first part payload
-                first = payload.get('parts', [])[0]
-                data = first.get('body', {}).get('data')
-                if data:
-                    body = base64.urlsafe_b64decode(data.encode('utf-8')).decode('utf-8', errors='replace')
-        else:
-            data = payload.get('body', {}).get('data')
+        if not metadata_only:
+            data = _find_body_data(msg.get('payload', {}))
             if data:
-                body = base64.urlsafe_b64decode(data.encode('utf-8')).decode('utf-8', errors='replace')
-
-        # simple cleanup: if body seems to be raw email, parse and extract payload
-        if body and '\n\n' in body and 'From:' in body[:200]:
-            try:
-                parsed = py_email.message_from_string(body)
-                if parsed.is_multipart():
-                    for part in parsed.walk():
-                        if part.get_content_type() == 'text/plain':
-                            body = part.get_payload(decode=True).decode(part.get_content_charset() or 'utf-8', errors='replace')
-                            break
-                else:
-                    body = parsed.get_payload(decode=True).decode(parsed.get_content_charset() or 'utf-8', errors='replace')
-            except Exception:
-                pass
+                body = urlsafe_b64decode(data).decode('utf-8', errors='replace')
 
         # try to extract receive/internal date (milliseconds since epoch)
         received = None
@@ -144,12 +454,21 @@ class GmailClient:
             internal = msg.get('internalDate') or msg.get('internal_date')
             if internal:
                 # internalDate is milliseconds since epoch
-                ts = int(internal) / 1000.0
-                received = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+                received = _ms_to_iso(int(internal))
         except Exception:
             received = None
+        if received is None and headers.get('Date'):
+            # fall back to the sender-supplied Date header
+            try:
+                from email.utils import parsedate_to_datetime
+
+                sent_at = parsedate_to_datetime(headers['Date'])
+                if sent_at.tzinfo is None:
+                    sent_at = sent_at.replace(tzinfo=timezone.utc)
+                received = sent_at.astimezone(timezone.utc).isoformat()
+            except Exception:
+                received = None
 
-        label_ids = msg.get('labelIds') or []
         return {
             'id': msg.get('id'),
             'from': from_hdr,
@@ -157,66 +476,123 @@ class GmailClient:
             'body': body,
             'snippet': snippet,
             'received': received,
-            'label_ids': label_ids,
-            'labels': self._label_names_from_ids(label_ids),
         }
 
     def _generate_stub_emails(self, label_key: str, limit: int) -> List[Dict[str, Any]]:
         """Return deterministic stub data per mailbox for local development."""
-        now = datetime.now(timezone.utc)
-        fixtures = {
-            'inbox': [
-                {
-                    'id': 'stub-inbox-1',
-                    'from': 'alice@example.com',
-                    'subject': 'Meeting request: Q4 roadmap',
-                    'body': 'Hi, can we meet next Tuesday at 10am to go over the Q4 roadmap? Regards, Alice'
-                },
-                {
-                    'id': 'stub-inbox-2',
-                    'from': 'bob@example.com',
-                    'subject': 'Quick sync',
-                    'body': 'Can we do a quick sync tomorrow afternoon?'
-                },
-            ],
-            'sent': [
-                {
-                    'id': 'stub-sent-1',
-                    'from': 'you@example.com',
-                    'subject': 'Weekly status recap',
-                    'body': 'Sent over the highlights for this week—let me know if questions.'
-                }
-            ],
-            'drafts': [
-                {
-                    'id': 'stub-draft-1',
-                    'from': 'you@example.com',
-                    'subject': 'Draft: Contract follow-up',
-                    'body': 'Need to confirm pricing section before sending.'
-                }
-            ],
-            'trash': [
-                {
-                    'id': 'stub-trash-1',
-                    'from': 'promo@example.net',
-                    'subject': 'Limited time winnings!!!',
-                    'body': 'Click now to claim your prize.'
-                }
-            ],
-        }
-        data = fixtures.get(label_key, fixtures['inbox'])
+        now_ms = time.time_ns() // 1_000_000
+        data = STUB_EMAILS.get(label_key, STUB_EMAILS['inbox'])[:limit]
         stub_label = FOLDER_LABELS.get(label_key, label_key.upper())
         enriched: List[Dict[str, Any]] = []
         for idx, item in enumerate(data):
             enriched_item = dict(item)
             if 'received' not in enriched_item:
-                enriched_item['received'] = (now - timedelta(hours=idx * 3)).isoformat()
+                enriched_item['received'] = _ms_to_iso(now_ms - idx * 3 * 3_600_000)
             enriched_item.setdefault('labels', [stub_label])
             enriched_item.setdefault('label_ids', [stub_label])
             enriched.append(enriched_item)
-        return enriched[:limit]
+        return enriched
 
-    def _fetch_label_snapshot(self, label_key: str, page: int, per_page: int, days: int) -> Dict[str, Any]:
+    def _get_messages(self, message_ids: List[str], format: str = 'full', service=None) -> List[dict]:
+        """Fetch message resources for `message_ids`, preserving order.
+
+        Multiple ids are sent through Gmail batch requests (at most BATCH_MAX_SIZE per batch)
+        so a page costs one round-trip instead of one per message. A single id is fetched
+        directly. Failed sub-requests are retried in smaller batches with backoff; if some still
+        fail, the last error is raised so callers take their usual fallback rather than
+        returning a short page. Messages deleted in the meantime (404/410) are skipped. With
+        format='metadata' only METADATA_HEADERS are returned.
+        """
+        service = service or self.service
+        message_ids = [mid for mid in message_ids if mid]
+        messages = service.users().messages()
+        get_kwargs: Dict[str, Any] = {'userId': 'me', 'format': format}
+        if format == 'metadata':
+            get_kwargs['metadataHeaders'] = METADATA_HEADERS
+        if len(message_ids) == 1:
+            return [messages.get(id=message_ids[0], **get_kwargs).execute()]
+
+        responses: Dict[str, dict] = {}
+        errors: Dict[str, Exception] = {}
+
+        def _on_response(request_id: str, response: dict, exception: Optional[Exception]) -> None:
+            if exception is None:
+                responses[request_id] = response
+                return
+            status = getattr(getattr(exception, 'resp', None), 'status', None)
+            if status is not None and int(status) in GONE_STATUSES:
+                logger.warning('Gmail message %s no longer exists: %s', request_id, exception)
+                return
+            errors[request_id] = exception
+
+        pending = message_ids
+        batch_size = BATCH_MAX_SIZE
+        for attempt in range(BATCH_RETRY_ATTEMPTS + 1):
+            if attempt:
+                time.sleep(BATCH_RETRY_BACKOFF * 2 ** (attempt - 1))
+                batch_size = max(1, batch_size // 4)
+                logger.info('Retrying %d failed Gmail message fetches (attempt %d)', len(pending), attempt)
+            errors.clear()
+            for start in range(0, len(pending), batch_size):
+                batch = service.new_batch_http_request(callback=_on_response)
+                for mid in pending[start:start + batch_size]:
+                    batch.add(messages.get(id=mid, **get_kwargs), request_id=mid)
+                batch.execute()
+            pending = [mid for mid in pending if mid in errors]
+            if not pending:
+                break
+        else:
+            logger.warning('Failed to fetch %d Gmail messages after retries', len(pending))
+            raise errors[pending[0]]
+
+        return [responses[mid] for mid in message_ids if mid in responses]
+
+    def _nearest_page_token(self, key_prefix: tuple, page: int) -> tuple:
+        """Return (page, token) for the closest remembered page <= `page`, or (1, None).
+
+        Tokens are shared process-wide per account, since clients are built per request.
+        """
+        if not self._account:
+            return 1, None
+        key_prefix = (self._account,) + key_prefix
+        now = time.monotonic()
+        with _page_tokens_lock:
+            for candidate in range(page, 1, -1):
+                key = key_prefix + (candidate,)
+                entry = _page_tokens.get(key)
+                if entry is None:
+                    continue
+                token, stamp = entry
+                if now - stamp >= PAGE_TOKEN_TTL:
+                    del _page_tokens[key]
+                    continue
+                _page_tokens.move_to_end(key)
+                return candidate, token
+        return 1, None
+
+    def _remember_page_token(self, key_prefix: tuple, page: int, token: Optional[str]) -> None:
+        if not token or not self._account:
+            return
+        key = (self._account,) + key_prefix + (page,)
+        with _page_tokens_lock:
+            _page_tokens[key] = (token, time.monotonic())
+            _page_tokens.move_to_end(key)
+            if len(_page_tokens) > PAGE_TOKEN_CACHE_SIZE:
+                _page_tokens.popitem(last=False)
+
+    def _fetch_label_snapshot(
+        self,
+        label_key: str,
+        page: int,
+        per_page: int,
+        days: int,
+        metadata_only: bool = True
+    ) -> Dict[str, Any]:
+        """Fetch one page of a folder.
+
+        List views only need headers, snippet and labels, so by default messages are fetched
+        with format='metadata' and `body` is empty; callers load it on demand via `get_message`.
+        """
         label_id = FOLDER_LABELS[label_key]
         per_page = max(1, min(per_page, 50))
 
@@ -229,26 +605,32 @@ class GmailClient:
             }
 
         try:
+            service = self._thread_service()
             q = f'newer_than:{days}d'
             kwargs = {
                 'userId': 'me',
                 'labelIds': [label_id],
                 'maxResults': per_page,
-                'q': q
+                'q': q,
+                'fields': LIST_FIELDS,
             }
-            request = self.service.users().messages().list(**kwargs)
-            current_page = 1
+            # Resume from the deepest page token seen so far instead of re-listing from page 1.
+            token_key = (label_id, per_page, q)
+            current_page, page_token = self._nearest_page_token(token_key, page)
+            if page_token:
+                request = service.users().messages().list(pageToken=page_token, **kwargs)
+            else:
+                request = service.users().messages().list(**kwargs)
             response = request.execute()
+            self._remember_page_token(token_key, current_page + 1, response.get('nextPageToken'))
             while current_page < page and response.get('nextPageToken'):
                 current_page += 1
-                request = self.service.users().messages().list(
-                    userId='me',
-                    labelIds=[label_id],
-                    maxResults=per_page,
-                    q=q,
-                    pageToken=response['nextPageToken']
+                request = service.users().messages().list(
+                    pageToken=response['nextPageToken'],
+                    **kwargs
                 )
                 response = request.execute()
+                self._remember_page_token(token_key, current_page + 1, response.get('nextPageToken'))
 
             if current_page < page:
                 return {
@@ -259,14 +641,14 @@ class GmailClient:
                 }
 
             msgs = response.get('messages', [])
-            results: List[Dict[str, Any]] = []
-            for m in msgs:
-                mid = m.get('id')
-                if not mid:
-                    continue
-                full = self.service.users().messages().get(userId='me', id=mid, format='full').execute()
-                parsed = self._parse_message(full)
-                results.append(parsed)
+            results: List[Dict[str, Any]] = [
+                self._parse_message(full, metadata_only=metadata_only)
+                for full in self._get_messages(
+                    [m.get('id') for m in msgs],
+                    format='metadata' if metadata_only else 'full',
+                    service=service
+                )
+            ]
 
             return {
                 'label': label_id,
@@ -295,9 +677,25 @@ class GmailClient:
         normalized = normalized_key if normalized_key in FOLDER_LABELS else 'inbox'
         per_page = max(1, min(per_page, 50))
         overview: Dict[str, Any] = {}
-        for folder_key in FOLDER_LABELS.keys():
-            folder_page = page if folder_key == normalized else 1
-            overview[folder_key] = self._fetch_label_snapshot(folder_key, folder_page, per_page, days)
+        if self.service is None:
+            for folder_key in FOLDER_KEYS:
+                folder_page = page if folder_key == normalized else 1
+                overview[folder_key] = self._fetch_label_snapshot(folder_key, folder_page, per_page, days)
+        else:
+            # Warm the label cache once here rather than racing four refreshes in the workers.
+            self._get_labels()
+            executor = _get_overview_executor()
+            futures = {
+                folder_key: executor.submit(
+                    self._fetch_label_snapshot,
+                    folder_key,
+                    page if folder_key == normalized else 1,
+                    per_page,
+                    days
+                )
+                for folder_key in FOLDER_KEYS
+            }
+            overview = {folder_key: future.result() for folder_key, future in futures.items()}
 
         return {
             'active_folder': normalized,
@@ -312,33 +710,36 @@ class GmailClient:
         overview = self.fetch_mailbox_overview(active_folder='inbox', page=page, per_page=per_page, days=days)
         return overview.get('folders', {}).get('inbox', {}).get('items', [])
 
-    def fetch_emails_since(self, days: int = 7, max_results: Optional[int] = None) -> List[Dict]:
+    def fetch_emails_since(
+        self, days: int = 7, max_results: Optional[int] = None, metadata_only: bool = False
+    ) -> List[Dict]:
         """Fetch emails from the authenticated user's mailbox from the past `days` days.
 
+        With `metadata_only` the messages are fetched with format='metadata' and `body` is left
+        empty; callers load bodies on demand with `get_message`.
+
         If not authenticated, returns the same stubbed emails as `fetch_recent_emails`.
         """
         # If service missing, return stubs
         if self.service is None:
-            return self.fetch_recent_emails(max_results=max_results or 5)
+            return self.fetch_recent_emails(per_page=max_results or 5)
 
         # Gmail search operator 'newer_than:Xd' is convenient
         q = f'newer_than:{days}d'
         try:
-            req = self.service.users().messages().list(userId='me', q=q)
+            kwargs: Dict[str, Any] = {'userId': 'me', 'q': q, 'fields': LIST_FIELDS}
             if max_results:
-                req = self.service.users().messages().list(userId='me', q=q, maxResults=max_results)
-            resp = req.execute()
+                kwargs['maxResults'] = max_results
+            resp = self.service.users().messages().list(**kwargs).execute()
             msgs = resp.get('messages', [])
-            results = []
-            for m in msgs:
-                mid = m.get('id')
-                full = self.service.users().messages().get(userId='me', id=mid, format='full').execute()
-                parsed = self._parse_message(full)
-                results.append(parsed)
-            return results
+            fmt = 'metadata' if metadata_only else 'full'
+            return [
+                self._parse_message(full, metadata_only=metadata_only)
+                for full in self._get_messages([m.get('id') for m in msgs], format=fmt)
+            ]
         except HttpError as e:
             logger.exception('Gmail API error while fetching by time: %s', e)
-            return self.fetch_recent_emails(max_results=max_results or 5)
+            return self.fetch_recent_emails(per_page=max_results or 5)
 
     def fetch_emails_by_label(self, label: str = 'INBOX', max_results: Optional[int] = None) -> List[Dict]:
         """Fetch emails from a specific label (folder).
@@ -351,25 +752,20 @@ class GmailClient:
             The list of emails
         """
         if self.service is None:
-            return self.fetch_recent_emails(max_results=max_results or 5)
+            return self.fetch_recent_emails(per_page=max_results or 5)
         
         try:
-            req = self.service.users().messages().list(userId='me', labelIds=[label])
+            kwargs: Dict[str, Any] = {'userId': 'me', 'labelIds': [label], 'fields': LIST_FIELDS}
             if max_results:
-                req = req.maxResults(max_results)
-            resp = req.execute()
+                kwargs['maxResults'] = max_results
+            resp = self.service.users().messages().list(**kwargs).execute()
             msgs = resp.get('messages', [])
-            results = []
-            for m in msgs:
-                mid = m.get('id')
-                full = self.service.users().messages().get(userId='me', id=mid, format='full').execute()
-                parsed = self._parse_message(full)
-                results.append(parsed)
-            return results
+            return [self._parse_message(full) for full in self._get_messages([m.get('id') for m in msgs])]
         except HttpError as e:
             logger.exception('Gmail API error while fetching by label: %s', e)
             return []
 
+    @_gmail_call(reraise=True)
     def send_email(self, to: str, subject: str, body: str, cc: Optional[str] = None, bcc: Optional[str] = None) -> str:
         """Send an email.
         
@@ -387,32 +783,29 @@ class GmailClient:
             logger.warning('Gmail service not available; cannot send email')
             return 'stub-sent-id'
         
-        try:
-            # 构建邮件消息
-            message = py_email.message.EmailMessage()
-            message['To'] = to
-            message['Subject'] = subject
-            if cc:
-                message['Cc'] = cc
-            if bcc:
-                message['Bcc'] = bcc
-            message.set_content(body)
-            
-            # 编码为 base64url
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
-            
-            # 发送邮件
-            result = self.service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message}
-            ).execute()
-            
-            logger.info('Email sent successfully, id: %s', result.get('id'))
-            return result.get('id')
-        except HttpError as e:
-            logger.exception('Failed to send email: %s', e)
-            raise
+        # 构建邮件消息
+        message = _new_outgoing_message()
+        message['To'] = to
+        message['Subject'] = subject
+        if cc:
+            message['Cc'] = cc
+        if bcc:
+            message['Bcc'] = bcc
+        message.set_content(body)
+        
+        # 编码为 base64url
+        raw_message = _encode_raw(message)
+        
+        # 发送邮件
+        result = self.service.users().messages().send(
+            userId='me',
+            body={'raw': raw_message}
+        ).execute()
+        
+        logger.info('Email sent successfully, id: %s', result.get('id'))
+        return result.get('id')
 
+    @_gmail_call(reraise=True)
     def reply_to_email(self, message_id: str, body: str) -> str:
         """Reply to an email.
         
@@ -427,56 +820,59 @@ class GmailClient:
             logger.warning('Gmail service not available; cannot reply to email')
             return 'stub-reply-id'
         
-        try:
-            # 获取原始邮件
-            original = self.service.users().messages().get(userId='me', id=message_id, format='full').execute()
-            headers = {h['name']: h.get('value') for h in original.get('payload', {}).get('headers', [])}
-            
-            # 正确解析发件人邮箱地址
-            from_header = headers.get('From', '')
-            # 使用 parseaddr 来正确提取邮箱地址（处理 "Name <email@example.com>" 格式）
-            _, from_email = parseaddr(from_header)
-            if not from_email:
-                # 如果没有找到邮箱地址，尝试直接使用原始值
-                from_email = from_header.strip()
-            
-            # 构建回复消息
-            message = py_email.message.EmailMessage()
-            message['To'] = from_email
-            message['Subject'] = 'Re: ' + headers.get('Subject', '')
-            message['In-Reply-To'] = headers.get('Message-ID', '')
-            message['References'] = headers.get('Message-ID', '')
-            message.set_content(body)
-            
-            # 编码为 base64url
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
-            
-            # 发送回复
-            result = self.service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message, 'threadId': original.get('threadId')}
-            ).execute()
-            
-            logger.info('Reply sent successfully, id: %s', result.get('id'))
-            return result.get('id')
-        except HttpError as e:
-            logger.exception('Failed to reply to email: %s', e)
-            raise
+        from email.utils import parseaddr
+
+        # 获取原始邮件（仅线程 ID 与回复所需的头部）
+        original = self.service.users().messages().get(
+            userId='me',
+            id=message_id,
+            format='metadata',
+            metadataHeaders=['From', 'Subject', 'Message-ID', 'References'],
+            fields='threadId,payload/headers'
+        ).execute()
+        # 头部名称大小写不固定（如 Message-Id / Message-ID），统一按小写读取
+        headers = {h['name'].lower(): h.get('value') or '' for h in original.get('payload', {}).get('headers', [])}
 
+        # 正确解析发件人邮箱地址
+        from_header = headers.get('from', '')
+        # 使用 parseaddr 提取邮箱地址（处理 "Name <email@example.com>" 格式），失败时使用原始值
+        from_email = parseaddr(from_header)[1] or from_header.strip()
+        
+        # 构建回复消息
+        message = _new_outgoing_message()
+        message['To'] = from_email
+        message['Subject'] = 'Re: ' + headers.get('subject', '')
+        original_id = headers.get('message-id', '')
+        if original_id:
+            # References 需保留原有链并追加原邮件 ID，邮件客户端才能正确归入会话
+            message['In-Reply-To'] = original_id
+            message['References'] = f"{headers.get('references', '')} {original_id}".strip()
+        message.set_content(body)
+        
+        # 编码为 base64url
+        raw_message = _encode_raw(message)
+        
+        # 发送回复
+        result = self.service.users().messages().send(
+            userId='me',
+            body={'raw': raw_message, 'threadId': original.get('threadId')}
+        ).execute()
+        
+        logger.info('Reply sent successfully, id: %s', result.get('id'))
+        return result.get('id')
+
+    @_gmail_call(default=False)
     def delete_email(self, message_id: str) -> bool:
         """Move an email to Gmail Trash."""
         if self.service is None:
             logger.warning('Gmail service not available; cannot move email to trash')
             return False
 
-        try:
-            self.service.users().messages().trash(userId='me', id=message_id).execute()
-            logger.info('Email moved to trash, id: %s', message_id)
-            return True
-        except HttpError as e:
-            logger.exception('Failed to move email to trash: %s', e)
-            return False
+        self.service.users().messages().trash(userId='me', id=message_id).execute()
+        logger.info('Email moved to trash, id: %s', message_id)
+        return True
 
+    @_gmail_call(default=False)
     def mark_as_read(self, message_id: str, read: bool = True) -> bool:
         """Mark an email as read or unread.
         
@@ -491,27 +887,24 @@ class GmailClient:
             logger.warning('Gmail service not available; cannot mark email')
             return False
         
-        try:
-            if read:
-                # 移除 UNREAD 标签
-                self.service.users().messages().modify(
-                    userId='me',
-                    id=message_id,
-                    body={'removeLabelIds': ['UNREAD']}
-                ).execute()
-            else:
-                # 添加 UNREAD 标签
-                self.service.users().messages().modify(
-                    userId='me',
-                    id=message_id,
-                    body={'addLabelIds': ['UNREAD']}
-                ).execute()
-            logger.info('Email marked as %s, id: %s', 'read' if read else 'unread', message_id)
-            return True
-        except HttpError as e:
-            logger.exception('Failed to mark email: %s', e)
-            return False
+        if read:
+            # 移除 UNREAD 标签
+            self.service.users().messages().modify(
+                userId='me',
+                id=message_id,
+                body={'removeLabelIds': ['UNREAD']}
+            ).execute()
+        else:
+            # 添加 UNREAD 标签
+            self.service.users().messages().modify(
+                userId='me',
+                id=message_id,
+                body={'addLabelIds': ['UNREAD']}
+            ).execute()
+        logger.info('Email marked as %s, id: %s', 'read' if read else 'unread', message_id)
+        return True
 
+    @_gmail_call(default=False)
     def archive_email(self, message_id: str) -> bool:
         """Archive an email.
         
@@ -525,18 +918,15 @@ class GmailClient:
             logger.warning('Gmail service not available; cannot archive email')
             return False
         
-        try:
-            self.service.users().messages().modify(
-                userId='me',
-                id=message_id,
-                body={'removeLabelIds': ['INBOX']}
-            ).execute()
-            logger.info('Email archived successfully, id: %s', message_id)
-            return True
-        except HttpError as e:
-            logger.exception('Failed to archive email: %s', e)
-            return False
+        self.service.users().messages().modify(
+            userId='me',
+            id=message_id,
+            body={'removeLabelIds': ['INBOX']}
+        ).execute()
+        logger.info('Email archived successfully, id: %s', message_id)
+        return True
 
+    @_gmail_call(reraise=True)
     def check_or_create_label(self, label_name: str) -> str:
         """Check if a label exists, and create it if it doesn't.
         
@@ -550,25 +940,25 @@ class GmailClient:
             logger.warning('Gmail service not available; cannot check or create label')
             return 'stub-label-id'
         
-        try:
-            # Check if label exists
-            labels = self.service.users().labels().list(userId='me').execute().get('labels', [])
-            for label in labels:
-                if label['name'] == label_name:
-                    label_id = label['id']
-                    self._label_cache[label_id] = label_name
-                    return label_id
-            
-            # Create label if it doesn't exist
-            label_body = {'name': label_name, 'labelListVisibility': 'labelShow', 'messageListVisibility': 'show'}
-            label = self.service.users().labels().create(userId='me', body=label_body).execute()
-            label_id = label['id']
-            self._label_cache[label_id] = label_name
+        # Check if label exists; a miss on a cached snapshot is re-checked against a fresh
+        # list before creating, in case the label was added outside this client.
+        was_cached = bool(self._label_cache) and time.monotonic() - self._label_cache_ts < LABEL_CACHE_TTL
+        self._get_labels()
+        label_id = self._label_ids_by_name.get(label_name)
+        if label_id is None and was_cached:
+            self._refresh_label_cache()
+            label_id = self._label_ids_by_name.get(label_name)
+        if label_id is not None:
             return label_id
-        except HttpError as e:
-            logger.exception('Failed to check or create label: %s', e)
-            raise
 
+        # Create label if it doesn't exist
+        label_body = {'name': label_name, 'labelListVisibility': 'labelShow', 'messageListVisibility': 'show'}
+        label = self.service.users().labels().create(userId='me', body=label_body).execute()
+        label_id = label['id']
+        self._remember_label(label_id, label_name)
+        return label_id
+
+    @_gmail_call(default=False)
     def apply_labels_to_message(self, message_id: str, label_ids: List[str]) -> bool:
         """Apply labels to a message.
         
@@ -583,17 +973,14 @@ class GmailClient:
             logger.warning('Gmail service not available; cannot apply labels to message')
             return False
         
-        try:
-            self.service.users().messages().modify(
-                userId='me',
-                id=message_id,
-                body={'addLabelIds': label_ids}
-            ).execute()
-            return True
-        except HttpError as e:
-            logger.exception('Failed to apply labels to message: %s', e)
-            return False
+        self.service.users().messages().modify(
+            userId='me',
+            id=message_id,
+            body={'addLabelIds': label_ids}
+        ).execute()
+        return True
 
+    @_gmail_call()
     def get_message(self, message_id: str) -> Optional[Dict[str, Any]]:
         """Fetch a single Gmail message by ID and parse it into a dict with id, from, subject, body, received."""
         if self.service is None:
@@ -605,33 +992,29 @@ class GmailClient:
                 "body": "This is a stubbed email body for testing.",
                 "received": datetime.now(timezone.utc).isoformat(),
             }
-        try:
-            full = self.service.users().messages().get(
-                userId="me", id=message_id, format="full"
-            ).execute()
+        full = self.service.users().messages().get(
+            userId="me", id=message_id, format="full"
+        ).execute()
 
-            # Use your existing parser
-            parsed = self._parse_message(full)
-
-            # Add fallbacks if body is empty
-            if not parsed.get("body"):
-                parsed["body"] = full.get("snippet") or ""
-                # Sometimes raw payload exists
-                if not parsed["body"]:
-                    payload = full.get("payload", {})
-                    data = payload.get("body", {}).get("data")
-                    if data:
-                        try:
-                            parsed["body"] = base64.urlsafe_b64decode(data.encode("utf-8")).decode(
-                                "utf-8", errors="replace"
-                            )
-                        except Exception:
-                            parsed["body"] = ""
-
-            return parsed
-        except HttpError as e:
-            logger.exception("Failed to fetch Gmail message %s: %s", message_id, e)
-            return None
+        # Use your existing parser
+        parsed = self._parse_message(full)
+
+        # Add fallbacks if body is empty
+        if not parsed.get("body"):
+            parsed["body"] = full.get("snippet") or ""
+            # Sometimes raw payload exists
+            if not parsed["body"]:
+                payload = full.get("payload", {})
+                data = payload.get("body", {}).get("data")
+                if data:
+                    try:
+                        parsed["body"] = urlsafe_b64decode(data).decode(
+                            "utf-8", errors="replace"
+                        )
+                    except Exception:
+                        parsed["body"] = ""
+
+        return parsed
 
     def create_draft(
         self,
@@ -683,7 +1066,7 @@ class GmailClient:
                     logger.warning('Could not fetch original message headers for reply: %s', e)
 
             # Encode the message
-            raw = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+            raw = _encode_raw(message)
 
             # Create the draft
             draft_body: Dict[str, Any] = {'message': {'raw': raw}}
@@ -1,16 +1,70 @@
 """Rule management and processed-email tracking for auto labeling."""
 from __future__ import annotations
 
+import atexit
+import hashlib
 import json
+import logging
+import os
+import queue
+import sqlite3
 from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
-from threading import RLock  # Changed from Lock to RLock
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+import time
+from threading import Lock, RLock, Thread, local  # Changed from Lock to RLock
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 import uuid
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# 512 Kbit with two hash probes: well under 0.1% false positives at a few thousand ids.
+BLOOM_FILTER_BYTES = 65536
+BLOOM_FILTER_BITS = BLOOM_FILTER_BYTES * 8
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# orjson serializes in C with far fewer allocations; fall back to the stdlib encoder.
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# ijson lets the one-time legacy import stream entries instead of parsing the whole file.
+try:
+    import ijson
+except Exception:
+    ijson = None
+
+
+def _dumps(payload: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write via a temp file and os.replace so readers never see a truncated file.
+
+    There is deliberately no fsync: the rules file is small, and losing the last edit in a
+    power failure is not worth a disk flush per save.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+@dataclass(frozen=True, slots=True)
 class AutoLabelRule:
     id: str
     label: str
@@ -30,73 +84,134 @@ class AutoLabelRule:
 
 
 class RuleManager:
+    """Persisted auto-label rules.
+
+    Rules are indexed by id in an insertion-ordered dict, so lookups, updates and deletes are
+    O(1); the on-disk format stays a JSON list. The public getters return plain dict copies;
+    in-process hot paths can use `rule_views`, a tuple of read-only `MappingProxyType` views
+    rebuilt only when the rules change, to avoid per-rule copies. Use `state_json` for the
+    serialized state (cached until the next change).
+
+    Mutators only queue a save; a daemon writer thread serializes the latest state, so a burst
+    of edits collapses into one file rewrite and request handlers never wait on disk I/O.
+    """
+
     def __init__(self, storage_path: Path, default_enabled: bool = False) -> None:
         self.storage_path = storage_path
         self.default_enabled = default_enabled
         self._lock = RLock()  # Changed from Lock() to RLock()
+        self._io_lock = Lock()
+        self._rules: Dict[str, Dict[str, Any]] = {}
         self._state: Dict[str, Any] = self._load()
+        self._rule_views: Tuple[Mapping[str, Any], ...] = ()
+        self._state_json: Optional[bytes] = None
+        self._refresh_views_locked()
+        self._save_queue: "queue.Queue[None]" = queue.Queue()
+        Thread(target=self._writer_loop, name="rule-writer", daemon=True).start()
+        atexit.register(self.flush)
 
     def _load(self) -> Dict[str, Any]:
         if not self.storage_path.exists():
-            return {"automation_enabled": self.default_enabled, "rules": []}
+            return {"automation_enabled": self.default_enabled}
         try:
-            payload = json.loads(self.storage_path.read_text(encoding="utf-8"))
+            payload = _loads(self.storage_path.read_bytes())
             payload.setdefault("automation_enabled", self.default_enabled)
-            payload.setdefault("rules", [])
+            rules = payload.pop("rules", None) or []
+            self._rules = {rule["id"]: rule for rule in rules if isinstance(rule, dict) and rule.get("id")}
             return payload
         except Exception:
-            return {"automation_enabled": self.default_enabled, "rules": []}
+            return {"automation_enabled": self.default_enabled}
 
     def _save(self) -> None:
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.storage_path.open("w", encoding="utf-8") as fh:
-            json.dump(self._state, fh, ensure_ascii=False, indent=2)
+        self._refresh_views_locked()
+        self._state_json = None
+        self._save_queue.put(None)
+
+    def _writer_loop(self) -> None:
+        while True:
+            self._save_queue.get()
+            pending = 1
+            # Later requests are covered by the snapshot we are about to write.
+            while True:
+                try:
+                    self._save_queue.get_nowait()
+                except queue.Empty:
+                    break
+                pending += 1
+            try:
+                # Only the snapshot is taken under the state lock; rule dicts are replaced, never
+                # mutated, so a shallow copy is stable while it is serialized and written.
+                with self._lock:
+                    snapshot = dict(self._state, rules=list(self._rules.values()))
+                with self._io_lock:
+                    _atomic_write(self.storage_path, _dumps(snapshot, indent=True))
+            except Exception:
+                logger.exception("Failed to save auto-label rules to %s", self.storage_path)
+            finally:
+                for _ in range(pending):
+                    self._save_queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued save has been written."""
+        self._save_queue.join()
+
+    def _refresh_views_locked(self) -> None:
+        self._rule_views = tuple(MappingProxyType(rule) for rule in self._rules.values())
+
+    def rule_views(self) -> Tuple[Mapping[str, Any], ...]:
+        """Read-only views of the current rules; not JSON-serializable, use `list_rules` for that."""
+        return self._rule_views
 
     def list_rules(self) -> List[Dict[str, Any]]:
         with self._lock:
-            return [dict(rule) for rule in self._state.get("rules", [])]
+            return [dict(rule) for rule in self._rules.values()]
 
     def add_rule(self, label: str, reason: str, label_id: Optional[str] = None) -> Dict[str, Any]:
-        rule = AutoLabelRule.create(label=label, reason=reason, label_id=label_id)
+        rule = asdict(AutoLabelRule.create(label=label, reason=reason, label_id=label_id))
         with self._lock:
-            rules = self._state.setdefault("rules", [])
-            rules.append(asdict(rule))
+            self._rules[rule["id"]] = rule
             self._save()
-            return dict(rules[-1])
+            return dict(rule)
 
     def delete_rule(self, rule_id: str) -> bool:
         with self._lock:
-            rules = self._state.get("rules", [])
-            initial = len(rules)
-            self._state["rules"] = [r for r in rules if r.get("id") != rule_id]
-            if len(self._state["rules"]) != initial:
-                self._save()
-                return True
-            return False
+            if self._rules.pop(rule_id, None) is None:
+                return False
+            self._save()
+            return True
 
     def update_rule(self, rule_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
         with self._lock:
-            for rule in self._state.get("rules", []):
-                if rule.get("id") == rule_id:
-                    rule.update({k: v for k, v in fields.items() if v is not None})
-                    self._save()
-                    return dict(rule)
-        return None
+            rule = self._rules.get(rule_id)
+            if rule is None:
+                return None
+            # Replace rather than mutate so views handed out earlier stay unchanged.
+            updated = {**rule, **{k: v for k, v in fields.items() if v is not None}}
+            self._rules[rule_id] = updated
+            self._save()
+            return dict(updated)
 
     def get_rule(self, rule_id: str) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            for rule in self._state.get("rules", []):
-                if rule.get("id") == rule_id:
-                    return dict(rule)
-        return None
+        rule = self._rules.get(rule_id)
+        return dict(rule) if rule is not None else None
 
     def get_state(self) -> Dict[str, Any]:
         with self._lock:
             return {
                 "automation_enabled": bool(self._state.get("automation_enabled", self.default_enabled)),
-                "rules": [dict(rule) for rule in self._state.get("rules", [])],
+                "rules": [dict(rule) for rule in self._rules.values()],
             }
 
+    def state_json(self) -> bytes:
+        """Return `get_state()` serialized as JSON, rebuilt only after a change."""
+        with self._lock:
+            if self._state_json is None:
+                self._state_json = _dumps({
+                    "automation_enabled": bool(self._state.get("automation_enabled", self.default_enabled)),
+                    "rules": list(self._rules.values()),
+                })
+            return self._state_json
+
     def set_automation_enabled(self, enabled: bool) -> Dict[str, Any]:
         with self._lock:
             self._state["automation_enabled"] = bool(enabled)
@@ -108,58 +223,196 @@ class RuleManager:
             return bool(self._state.get("automation_enabled", self.default_enabled))
 
 
+def _is_sqlite_file(path: Path) -> bool:
+    """True for a SQLite database; an empty file counts, since SQLite initialises it in place."""
+    try:
+        with path.open("rb") as fh:
+            header = fh.read(len(SQLITE_HEADER))
+    except OSError:
+        return False
+    return not header or header == SQLITE_HEADER
+
+
 class ProcessedEmailStore:
+    """Persisted set of message ids that have already been handled.
+
+    Backed by a SQLite table in WAL mode: a mark is one upsert, membership is one primary-key
+    lookup, and readers on other threads (each thread gets its own connection) never wait on a
+    writer. `synchronous=NORMAL` skips the per-commit fsync; the store only caches remote
+    state, so losing the last few marks in a crash just means those messages are evaluated
+    again.
+
+    Pruning (by age, then by count) runs at startup and whenever roughly 10% of
+    `max_entries` new marks have accumulated, rather than on every insert.
+
+    An in-memory bloom filter over every id marked since startup answers most "not processed"
+    lookups without touching SQLite. Pruned ids keep their bits; they only cost a fall-through
+    query.
+    """
+
     def __init__(self, storage_path: Path, max_age_days: int = 30, max_entries: int = 2000) -> None:
+        self._legacy_path = storage_path.with_suffix(".json")
+        if storage_path.suffix == ".json" or (storage_path.exists() and not _is_sqlite_file(storage_path)):
+            # Configured path still points at the old JSON store: keep it as the import source and
+            # put the database next to it.
+            self._legacy_path = storage_path
+            storage_path = storage_path.with_suffix(".db")
+            if storage_path == self._legacy_path:
+                raise RuntimeError(
+                    f"{storage_path} is not a SQLite database. Rename it to {storage_path.with_suffix('.json')} "
+                    "so it is imported on startup, or point AUTO_LABEL_PROCESSED_PATH at a new .db file."
+                )
         self.storage_path = storage_path
         self.max_age_days = max_age_days
         self.max_entries = max_entries
         self._lock = RLock()  # Changed from Lock() to RLock()
-        self._state = self._load()
+        self._local = local()
+        self._connections: List[sqlite3.Connection] = []
+        self._marks_since_prune = 0
+        self._bloom = bytearray(BLOOM_FILTER_BYTES)
+        fresh = not self.storage_path.exists()
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS processed (id TEXT PRIMARY KEY, ts REAL NOT NULL) WITHOUT ROWID")
+        conn.execute("CREATE INDEX IF NOT EXISTS processed_ts ON processed (ts)")
+        if fresh:
+            self._import_legacy()
+        with self._lock:
+            self._prune_locked()
+        with self._lock:
+            for (message_id,) in conn.execute("SELECT id FROM processed"):
+                self._bloom_add(message_id)
+        atexit.register(self.close)
 
-    def _load(self) -> Dict[str, str]:
-        if not self.storage_path.exists():
-            return {}
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.storage_path), isolation_level=None, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _import_legacy(self) -> None:
+        """Import the old JSON dict (message id -> ISO timestamp) stored next to the database."""
+        legacy_path = self._legacy_path
+        if legacy_path == self.storage_path or not legacy_path.exists():
+            return
+        entries = []
         try:
-            return json.loads(self.storage_path.read_text(encoding="utf-8"))
+            with legacy_path.open("rb") as fh:
+                if ijson is not None:
+                    items = ijson.kvitems(fh, "")
+                else:
+                    state = _loads(fh.read())
+                    items = state.items() if isinstance(state, dict) else ()
+                for message_id, stamp in items:
+                    try:
+                        entries.append((message_id, _epoch(stamp)))
+                    except Exception:
+                        continue
         except Exception:
-            return {}
+            # A partial import is fine: anything missed is simply evaluated again.
+            pass
+        if entries:
+            self._upsert(entries)
 
-    def _save(self) -> None:
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.storage_path.open("w", encoding="utf-8") as fh:
-            json.dump(self._state, fh, ensure_ascii=False, indent=2)
+    def _bloom_add(self, message_id: str) -> None:
+        # Callers hold self._lock: `|=` on a bytearray item is a read-modify-write, and automation
+        # and request threads mark concurrently, so unlocked updates could drop bits.
+        bloom = self._bloom
+        for pos in _bloom_positions(message_id):
+            bloom[pos >> 3] |= 1 << (pos & 7)
+
+    def _bloom_may_contain(self, message_id: str) -> bool:
+        bloom = self._bloom
+        return all(bloom[pos >> 3] & (1 << (pos & 7)) for pos in _bloom_positions(message_id))
+
+    def _upsert(self, entries: List[Tuple[str, float]]) -> None:
+        conn = self._conn()
+        with self._lock:
+            for message_id, _ in entries:
+                self._bloom_add(message_id)
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("INSERT OR REPLACE INTO processed (id, ts) VALUES (?, ?)", entries)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def _prune_locked(self) -> None:
-        if not self._state:
-            return
-        cutoff = datetime.now(timezone.utc) - timedelta(days=self.max_age_days)
-        self._state = {mid: ts for mid, ts in self._state.items() if _is_recent(ts, cutoff)}
-        if len(self._state) > self.max_entries:
-            # Keep the newest entries only
-            sorted_items = sorted(self._state.items(), key=lambda item: item[1], reverse=True)
-            self._state = dict(sorted_items[: self.max_entries])
+        conn = self._conn()
+        conn.execute("DELETE FROM processed WHERE ts < ?", (time.time() - self.max_age_days * 86400,))
+        conn.execute(
+            "DELETE FROM processed WHERE id IN "
+            "(SELECT id FROM processed ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._marks_since_prune = 0
+
+    def _after_marks(self, count: int) -> None:
+        with self._lock:
+            self._marks_since_prune += count
+            if self._marks_since_prune > self.max_entries * 0.1:
+                self._prune_locked()
 
     def mark_processed(self, message_id: str) -> None:
+        conn = self._conn()
+        # Set the filter bits before the row exists so a concurrent reader never gets a false "no";
+        # holding the lock across both keeps a concurrent reset() from clearing one but not the other.
         with self._lock:
-            self._state[message_id] = datetime.now(timezone.utc).isoformat()
-            self._prune_locked()
-            self._save()
+            self._bloom_add(message_id)
+            conn.execute("INSERT OR REPLACE INTO processed (id, ts) VALUES (?, ?)", (message_id, time.time()))
+        self._after_marks(1)
+
+    def mark_processed_many(self, message_ids: Iterable[str]) -> None:
+        """Mark several messages at once with a single timestamp and transaction."""
+        stamp = time.time()
+        entries = [(message_id, stamp) for message_id in message_ids if message_id]
+        if not entries:
+            return
+        self._upsert(entries)
+        self._after_marks(len(entries))
 
     def is_processed(self, message_id: str) -> bool:
-        with self._lock:
-            return message_id in self._state
+        if not self._bloom_may_contain(message_id):
+            return False
+        row = self._conn().execute("SELECT 1 FROM processed WHERE id = ? LIMIT 1", (message_id,)).fetchone()
+        return row is not None
 
     def reset(self) -> None:
         with self._lock:
-            self._state = {}
-            self._save()
+            self._conn().execute("DELETE FROM processed")
+            self._marks_since_prune = 0
+            self._bloom = bytearray(BLOOM_FILTER_BYTES)
 
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = local()
 
-def _is_recent(timestamp: str, cutoff: datetime) -> bool:
-    try:
-        mark = datetime.fromisoformat(timestamp)
-        if mark.tzinfo is None:
-            mark = mark.replace(tzinfo=timezone.utc)
-    except Exception:
-        return False
-    return mark >= cutoff
+
+def _bloom_positions(message_id: str) -> Tuple[int, int]:
+    digest = hashlib.blake2b(message_id.encode("utf-8"), digest_size=8).digest()
+    return (
+        int.from_bytes(digest[:4], "little") % BLOOM_FILTER_BITS,
+        int.from_bytes(digest[4:], "little") % BLOOM_FILTER_BITS,
+    )
+
+
+def _epoch(value: Any) -> float:
+    """Convert a stored timestamp (POSIX seconds or a legacy ISO string) to POSIX seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    mark = datetime.fromisoformat(value)
+    if mark.tzinfo is None:
+        mark = mark.replace(tzinfo=timezone.utc)
+    return mark.timestamp()
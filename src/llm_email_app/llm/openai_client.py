@@ -11,38 +11,288 @@ Behaviour contract (simple):
 
 The wrapper tries to parse JSON returned by the model. The prompt asks the model to reply with JSON only.
 """
-from typing import Dict, Any, Optional, List, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Mapping, Optional, List, Sequence, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import importlib.util
 import os
 import json
 import re
-import requests
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import logging
+from threading import Lock
+import time
 
 from llm_email_app.config import settings
 
+if TYPE_CHECKING:
+    import requests
+
+# orjson encodes request payloads and decodes completions in C; fall back to the stdlib codec.
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# pyahocorasick matches every rule keyword in one pass over the email; optional, falls back to a regex union.
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+# Only retry what the provider never processed: failed connects and 429 rate limits. A read
+# timeout or 5xx may come after the completion ran (and was billed), so those are not replayed.
+RETRY_STATUS_CODES = (429,)
+
+# Timezone the summarize prompt resolves relative dates in; Hong Kong has no DST, so the fixed
+# offset is an exact stand-in when the tz database is not installed.
+try:
+    PROMPT_TIMEZONE = ZoneInfo('Asia/Hong_Kong')
+except ZoneInfoNotFoundError:  # pragma: no cover - depends on system tzdata
+    PROMPT_TIMEZONE = timezone(timedelta(hours=8))
+
+# temperature=0 completions are deterministic, so identical requests are answered from memory.
+RESPONSE_CACHE_SIZE = 512
+
+
+# Prompts are module constants so every request sends a byte-identical prefix, which lets
+# providers with prompt caching (OpenAI, vLLM prefix cache) reuse the prefill across calls.
+SUMMARIZE_SYSTEM_PROMPT = (
+    "You are a helpful assistant that extracts scheduling information from a user's email. "
+    "Given the full email body and the sender, produce a short, clean, human-readable summary (include the sender's name if available), you should also translate the email content into English if it's not in English. "
+    "It is recommened to use as less words as possible to describe the email content. Never use more than 1 line to describe the email content. "
+    "You should consider the sender's context when summarizing the email and propose events accordingly. If it is a subscription or promotional email, you should report the true key information only. "
+    "an array of proposed events. Respond with JSON only (no extra explanation).\n\n"
+    "IMPORTANT: All proposed event datetimes must be expressed in Hong Kong local time (Asia/Hong_Kong, UTC+08:00). "
+    "Use full ISO 8601 timestamps with timezone offset +08:00, e.g. 2025-11-24T10:00:00+08:00."
+    "DATE FORMAT RECOGNITION: When parsing dates from the email body, you must be aware of different date formats based on location:\n"
+    "- For locations in Europe, Asia (including Hong Kong, UK, Australia, etc.): Use DD/MM format (day/month)\n"
+    "- For locations in North America (US, Canada): Use MM/DD format (month/day)\n"
+    "- Infer the location from the sender's email domain, email content, or location mentioned in the email\n"
+    "- If the date format is ambiguous (e.g., 01/02 could be Jan 2 or Feb 1), use context clues like:\n"
+    "  * Sender's email domain (.com, .uk, .au, .hk, etc.)\n"
+    " * Location mentioned in the email\n"
+    " * Language and cultural context\n"
+    "- When in doubt or no location is specified, default to DD/MM format\n\n"
+    "DRAFT REPLY GENERATION:\n"
+    "- If the email requires a response (e.g., meeting invitations, questions, requests for confirmation, action items), generate a draft reply.\n"
+    "- The draft reply should be professional, concise, and appropriate for the context.\n"
+    "- Do NOT generate a draft reply for:\n"
+    "  * Newsletters, promotional emails, or automated notifications\n"
+    "  * FYI/informational emails that don't require action\n"
+    "  * Emails where you are CC'd but not the primary recipient\n"
+    "- If no reply is needed, set draft_reply to null."
+)
+
+SUMMARIZE_OUTPUT_INSTRUCTIONS = (
+    "\nProduce a JSON object with keys:\n"
+    "- text: brief summary string\n"
+    "- proposals: an array (possibly empty) of objects with fields: title, start (ISO 8601), end (ISO 8601), attendees (array of emails), location, notes.\n"
+    "- draft_reply: an object with fields {subject, body} if a reply is appropriate, or null if no reply is needed.\n"
+    "  * subject: the reply email subject (usually 'Re: ' + original subject)\n"
+    "  * body: the draft reply text (professional, concise, without signature)\n"
+    "If there are no scheduling intents, use an empty array for proposals. Return JSON only.\n\n"
+    "IMPORTANT: Regardless of the timezone of any provided timestamps, return all proposal start/end datetimes in Hong Kong local time (Asia/Hong_Kong, UTC+08:00) using ISO 8601 with +08:00 offset."
+    "When parsing dates, consider the sender's location and use the appropriate date format (DD/MM for default or unspecified location, MM/DD for US/Canada)."
+)
+
+LABEL_RULES_SYSTEM_PROMPT = (
+    "You are an intelligent email triage assistant that evaluates emails against user-defined labeling rules. "
+    "Your task is to determine which rules match a given email based on the rule's description/reason. "
+    "You must analyze the email content, subject, and sender carefully to make accurate matching decisions.\n\n"
+    "MATCHING GUIDELINES:\n"
+    "- Only match a rule when the email CLEARLY satisfies the condition described in the rule's reason field.\n"
+    "- Consider the full context: subject line, sender address/name, and email body content.\n"
+    "- Be conservative - when uncertain, do NOT match. False positives are worse than false negatives.\n"
+    "- A rule's 'label' field is just the tag name; the 'reason' field describes WHEN to apply it.\n"
+    "- For promotional/marketing rules, look for sales language, discount codes, unsubscribe links.\n"
+    "- For sender-based rules, check if sender email/name matches the described criteria.\n"
+    "- For content-based rules, look for keywords or themes mentioned in the reason.\n\n"
+    "CONFIDENCE SCORING:\n"
+    "- 0.9-1.0: Perfect match, email explicitly satisfies the rule condition.\n"
+    "- 0.7-0.9: Strong match, high confidence the rule applies.\n"
+    "- 0.5-0.7: Moderate match, rule likely applies but some ambiguity.\n"
+    "- Below 0.5: Do NOT include in matches - not confident enough.\n\n"
+    "Respond with JSON only (no markdown, no extra explanation)."
+)
+
+_QUOTED_THREAD_RE = re.compile(r"(?m)^On .* wrote:$[\s\S]*")
+_QUOTED_LINE_RE = re.compile(r"(?m)^>.*$")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n(?:\s*\n)+")
+
+
+def _preprocess_body(body: str, max_chars: int = 6000) -> str:
+    """Trim an email body before it is sent to the model.
+
+    Drops quoted reply history, collapses runs of blank lines and truncates to `max_chars`,
+    preferring a sentence boundary, so long threads and newsletters cost fewer prompt tokens.
+    """
+    if not body:
+        return body
+    text = _QUOTED_THREAD_RE.sub('', body)
+    text = _QUOTED_LINE_RE.sub('', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text).strip()
+    if max_chars and len(text) > max_chars:
+        cut = text.rfind('. ', 0, max_chars)
+        # only honour the sentence boundary if it keeps most of the allowed text
+        text = text[:cut + 1] if cut >= max_chars // 2 else text[:max_chars]
+        text += '\n[truncated]'
+    return text
+
+
+_JSON_OBJECT_RE = re.compile(r"\{[\s\S]*\}")
+_DUPLICATE_COMMA_RE = re.compile(r",\s*,+")
+_JSON_DECODER = json.JSONDecoder()
+
 
 def _extract_json(text: str) -> Optional[dict]:
     """Try to extract the first JSON object from a model response.
 
     Returns parsed dict or None on failure.
     """
-    # common pattern: model may wrap JSON in ``` or plain text. Find first { ... }
-    m = re.search(r"\{[\s\S]*\}", text)
+    # common pattern: model may wrap JSON in ``` or plain text. Decode forward from the first
+    # '{' and stop at the end of that object, rather than a greedy regex scanning to the end.
+    start = text.find('{')
+    if start < 0:
+        return None
+    try:
+        obj, _ = _JSON_DECODER.raw_decode(text, start)
+        return obj
+    except ValueError:
+        pass
+    # try to fix common duplicated commas by a simple heuristic on the widest { ... } span
+    m = _JSON_OBJECT_RE.search(text, start)
     if not m:
         return None
-    candidate = m.group(0)
     try:
-        return json.loads(candidate)
+        return json.loads(_DUPLICATE_COMMA_RE.sub(",", m.group(0)))
     except Exception:
-        # try to fix common trailing commas by a simple heuristic
+        return None
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_response(resp: Any) -> str:
+    """Pretty-print a raw completion for debug logs (dicts, or SDK objects via pydantic's model_dump)."""
+    if not isinstance(resp, dict):
+        model_dump = getattr(resp, 'model_dump', None)
+        if model_dump is None:
+            return repr(resp)
         try:
-            fixed = re.sub(r",\s*,+", ",", candidate)
-            return json.loads(fixed)
+            resp = model_dump()
         except Exception:
-            return None
+            return repr(resp)
+    if orjson is not None:
+        return orjson.dumps(resp, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode('utf-8')
+    return json.dumps(resp, indent=2, ensure_ascii=False, default=str)
+
+
+def _rule_heuristics(rule: Mapping[str, Any]) -> Tuple[Optional[str], List[str]]:
+    """Return (rule_id, lowercase keywords) used by the offline label heuristic."""
+    rule_id = rule.get('id') or rule.get('rule_id')
+    label = (rule.get('label') or '').strip()
+    reason = (rule.get('reason') or '').strip()
+    if not rule_id or not (label or reason):
+        return None, []
+    heuristics = [label.lower()] if label else []
+    heuristics += [token.lower() for token in reason.split() if len(token) > 3]
+    return rule_id, heuristics
+
+
+class _KeywordRuleMatcher:
+    """Offline keyword matcher for a fixed rule set, built once and reused per email."""
+
+    def __init__(self, rules: Sequence[Mapping[str, Any]]):
+        self.rule_ids: List[str] = []
+        token_to_rules: Dict[str, List[str]] = {}
+        for rule in rules:
+            rule_id, heuristics = _rule_heuristics(rule)
+            if not rule_id:
+                continue
+            self.rule_ids.append(rule_id)
+            for token in heuristics:
+                if token:
+                    token_to_rules.setdefault(token, []).append(rule_id)
+        self.token_to_rules = token_to_rules
+        self._automaton = None
+        self._pattern = None
+        if not token_to_rules:
+            return
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for token, rule_ids in token_to_rules.items():
+                automaton.add_word(token, tuple(rule_ids))
+            automaton.make_automaton()
+            self._automaton = automaton
+            return
+        # Longest-first alternation inside a lookahead reports the longest keyword starting at every
+        # position; keywords contained in it are credited through `_contained`, so overlapping
+        # keywords still match exactly like the old per-token `in` checks.
+        tokens = sorted(token_to_rules, key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, tokens)) + '))')
+        self._contained: Dict[str, List[str]] = {
+            token: [other for other in tokens if other != token and other in token]
+            for token in tokens
+        }
 
-logger = logging.getLogger(__name__)
+    def match(self, corpus: str) -> List[str]:
+        """Return ids of rules with a keyword in `corpus` (already lowercased), in rule order."""
+        matched = set()
+        if self._automaton is not None:
+            for _, rule_ids in self._automaton.iter(corpus):
+                matched.update(rule_ids)
+        elif self._pattern is not None:
+            found = set()
+            for m in self._pattern.finditer(corpus):
+                token = m.group(1)
+                if token not in found:
+                    found.add(token)
+                    found.update(self._contained[token])
+            for token in found:
+                matched.update(self.token_to_rules[token])
+        return [rule_id for rule_id in self.rule_ids if rule_id in matched]
+
+
+def _build_session(api_key: str) -> "requests.Session":
+    """Create a keep-alive session for the OpenAI-format HTTP endpoint.
+
+    Reusing one pooled connection avoids a TCP+TLS handshake per call, which dominates
+    wall time for short prompts. `requests` is imported here so app startup does not pay for it.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update({'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'})
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({'POST'}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
 class OpenAIClient:
@@ -74,20 +324,79 @@ class OpenAIClient:
         # prefer explicit base URL: only use requests path when base, model, and key are all configured
         self._use_requests = bool(self.api_base and self.api_key and self.model)
         self._client = None
-
-        if not self._use_requests and self.api_key:
-            # try to use official openai SDK if available and no custom base provided
-            try:
-                import openai
-
-                openai.api_key = self.api_key
-                self._client = openai
-            except Exception:
-                # SDK not available; fall back to requests if api_base provided, else to stub
-                self._client = None
+        self._session: Optional["requests.Session"] = None
+        self._lazy_init_lock = Lock()
+        self._response_cache: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._response_cache_lock = Lock()
+        self._label_matcher: Optional[Tuple[Tuple[Any, ...], _KeywordRuleMatcher]] = None
+
+        # use the official openai SDK if it is installed and no custom base is provided; the
+        # import itself is deferred to the first request (see _get_openai_sdk)
+        self._use_sdk = bool(
+            not self._use_requests and self.api_key and importlib.util.find_spec('openai') is not None
+        )
 
     def _is_ready(self) -> bool:
-        return bool(self._client or self._use_requests)
+        return bool(self._use_sdk or self._use_requests)
+
+    def _get_session(self) -> "requests.Session":
+        if self._session is None:
+            with self._lazy_init_lock:
+                if self._session is None:
+                    self._session = _build_session(self.api_key)
+        return self._session
+
+    def _get_openai_sdk(self) -> Any:
+        """Import and configure the openai SDK on first use; None if it is unavailable."""
+        if self._client is None and self._use_sdk:
+            with self._lazy_init_lock:
+                if self._client is None and self._use_sdk:
+                    try:
+                        import openai
+
+                        openai.api_key = self.api_key
+                        self._client = openai
+                    except Exception:
+                        # SDK failed to import; fall back to the stub from now on
+                        logger.warning('openai SDK import failed; LLM calls are disabled', exc_info=True)
+                        self._use_sdk = False
+        return self._client
+
+    def _response_cache_key(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        cache_hint: Optional[List[Any]] = None,
+    ) -> str:
+        # `cache_hint` stands in for the messages when the prompt embeds volatile text (e.g. the clock)
+        request = {
+            'base': self.api_base,
+            'model': self.model,
+            'messages': messages if cache_hint is None else cache_hint,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def _cached_response(self, key: str) -> Optional[Tuple[str, Any]]:
+        with self._response_cache_lock:
+            hit = self._response_cache.get(key)
+            if hit is not None:
+                self._response_cache.move_to_end(key)
+            return hit
+
+    def _remember_response(self, key: str, text: str, resp: Any) -> None:
+        with self._response_cache_lock:
+            self._response_cache[key] = (text, resp)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def close(self) -> None:
+        """Release pooled HTTP connections held by the requests path."""
+        if self._session is not None:
+            self._session.close()
 
     def _chat_completion(
         self,
@@ -95,71 +404,66 @@ class OpenAIClient:
         temperature: float,
         max_tokens: int,
         context_tag: str,
+        cache_hint: Optional[List[Any]] = None,
     ) -> Tuple[str, Any]:
         if not self.model:
             raise RuntimeError('Model id must be provided via OPENAI_MODEL or constructor argument')
+        if temperature != 0:
+            return self._request_chat_completion(messages, temperature, max_tokens, context_tag)
+
+        cache_key = self._response_cache_key(messages, temperature, max_tokens, cache_hint)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            logger.debug('=== Cached LLM Response (%s) ===', context_tag)
+            return cached
+        text, resp = self._request_chat_completion(messages, temperature, max_tokens, context_tag)
+        self._remember_response(cache_key, text, resp)
+        return text, resp
+
+    def _request_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        context_tag: str,
+    ) -> Tuple[str, Any]:
         if self._use_requests:
             if not self.api_key or not self.model:
                 raise RuntimeError('API key and model are required when OPENAI_API_BASE is set')
             url = self.api_base.rstrip('/') + '/v1/chat/completions'
-            headers = {'Authorization': f'Bearer {self.api_key}', 'Content-Type': 'application/json'}
             payload = {
                 'model': self.model,
                 'messages': messages,
                 'temperature': temperature,
                 'max_tokens': max_tokens,
             }
-            r = requests.post(url, headers=headers, json=payload, timeout=30)
+            r = self._get_session().post(url, data=_dumps(payload), timeout=30)
             r.raise_for_status()
-            resp = r.json()
-            logger.info('=== Full Raw LLM Response (%s, requests) ===', context_tag)
-            logger.info(json.dumps(resp, indent=2, ensure_ascii=False))
+            resp = _loads(r.content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('=== Full Raw LLM Response (%s, requests) ===\n%s', context_tag, _dump_response(resp))
             choices = resp.get('choices', [])
             text = ''
             if choices:
                 first = choices[0]
                 if isinstance(first, dict):
                     text = first.get('message', {}).get('content', '') or first.get('text', '')
-            logger.info('=== Extracted Text Content (%s) ===', context_tag)
-            logger.info(text)
+            logger.debug('=== Extracted Text Content (%s) ===\n%s', context_tag, text)
             return text, resp
 
-        if not self._client:
+        client = self._get_openai_sdk()
+        if not client:
             raise RuntimeError('OpenAI client not configured')
 
-        resp = self._client.ChatCompletion.create(
+        resp = client.ChatCompletion.create(
             model=self.model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
         )
 
-        logger.info('=== Full Raw LLM Response (%s, SDK) ===', context_tag)
-        if isinstance(resp, dict):
-            logger.info(json.dumps(resp, indent=2, ensure_ascii=False))
-        else:
-            try:
-                resp_dict = {
-                    'id': getattr(resp, 'id', None),
-                    'object': getattr(resp, 'object', None),
-                    'created': getattr(resp, 'created', None),
-                    'model': getattr(resp, 'model', None),
-                    'choices': [
-                        {
-                            'index': getattr(choice, 'index', None),
-                            'message': {
-                                'role': getattr(getattr(choice, 'message', None), 'role', None),
-                                'content': getattr(getattr(choice, 'message', None), 'content', None),
-                            } if hasattr(choice, 'message') else None,
-                            'finish_reason': getattr(choice, 'finish_reason', None),
-                        }
-                        for choice in (getattr(resp, 'choices', []) or [])
-                    ],
-                }
-                logger.info(json.dumps(resp_dict, indent=2, ensure_ascii=False))
-            except Exception as exc:
-                logger.info('Raw response (object): %s', resp)
-                logger.info('Could not convert to dict: %s', exc)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('=== Full Raw LLM Response (%s, SDK) ===\n%s', context_tag, _dump_response(resp))
 
         text = ''
         choices = resp.get('choices') if isinstance(resp, dict) else getattr(resp, 'choices', None)
@@ -173,8 +477,7 @@ class OpenAIClient:
                 if not text:
                     text = getattr(first, 'text', '')
 
-        logger.info('=== Extracted Text Content (%s) ===', context_tag)
-        logger.info(text)
+        logger.debug('=== Extracted Text Content (%s) ===\n%s', context_tag, text)
         return text, resp
 
     def summarize_email(self, email_body: str, email_received_time: Optional[str] = None, current_time: Optional[str] = None, email_sender: Optional[str] = None, temperature: float = 0.0, max_tokens: int = settings.MAX_TOKEN, return_raw_response: bool = False) -> Dict[str, Any]:
@@ -208,35 +511,14 @@ class OpenAIClient:
             }
 
         # ensure current_time is populated for prompts
+        cache_time = current_time
         if not current_time:
-            current_time = datetime.now(timezone.utc).isoformat()
-
-        system_prompt = (
-            "You are a helpful assistant that extracts scheduling information from a user's email. "
-            "Given the full email body and the sender, produce a short, clean, human-readable summary (include the sender's name if available), you should also translate the email content into English if it's not in English. "
-            "It is recommened to use as less words as possible to describe the email content. Never use more than 1 line to describe the email content. "
-            "You should consider the sender's context when summarizing the email and propose events accordingly. If it is a subscription or promotional email, you should report the true key information only. "
-            "an array of proposed events. Respond with JSON only (no extra explanation).\n\n"
-            "IMPORTANT: All proposed event datetimes must be expressed in Hong Kong local time (Asia/Hong_Kong, UTC+08:00). "
-            "Use full ISO 8601 timestamps with timezone offset +08:00, e.g. 2025-11-24T10:00:00+08:00."
-            "DATE FORMAT RECOGNITION: When parsing dates from the email body, you must be aware of different date formats based on location:\n"
-            "- For locations in Europe, Asia (including Hong Kong, UK, Australia, etc.): Use DD/MM format (day/month)\n"
-            "- For locations in North America (US, Canada): Use MM/DD format (month/day)\n"
-            "- Infer the location from the sender's email domain, email content, or location mentioned in the email\n"
-            "- If the date format is ambiguous (e.g., 01/02 could be Jan 2 or Feb 1), use context clues like:\n"
-            "  * Sender's email domain (.com, .uk, .au, .hk, etc.)\n"
-            " * Location mentioned in the email\n"
-            " * Language and cultural context\n"
-            "- When in doubt or no location is specified, default to DD/MM format\n\n"
-            "DRAFT REPLY GENERATION:\n"
-            "- If the email requires a response (e.g., meeting invitations, questions, requests for confirmation, action items), generate a draft reply.\n"
-            "- The draft reply should be professional, concise, and appropriate for the context.\n"
-            "- Do NOT generate a draft reply for:\n"
-            "  * Newsletters, promotional emails, or automated notifications\n"
-            "  * FYI/informational emails that don't require action\n"
-            "  * Emails where you are CC'd but not the primary recipient\n"
-            "- If no reply is needed, set draft_reply to null."
-        )
+            now = datetime.now(timezone.utc)
+            current_time = now.isoformat()
+            # the prompt carries the exact clock, but a summary stays reusable for the rest of the
+            # day in the timezone the prompt resolves "tomorrow"/"this Friday" in
+            cache_time = now.astimezone(PROMPT_TIMEZONE).date().isoformat()
+
 
         # include received/current time context to help the model propose sensible event datetimes
         time_context = ""
@@ -249,23 +531,17 @@ class OpenAIClient:
         if email_sender:
             sender_context = f"Email sender: {email_sender}. "
 
+        email_body = _preprocess_body(email_body, settings.LLM_BODY_MAX_CHARS)
+
         user_prompt = (
             "Email:\n" + email_body + "\n\n"
             + sender_context
             + time_context
-            + "\nProduce a JSON object with keys:\n"
-            "- text: brief summary string\n"
-            "- proposals: an array (possibly empty) of objects with fields: title, start (ISO 8601), end (ISO 8601), attendees (array of emails), location, notes.\n"
-            "- draft_reply: an object with fields {subject, body} if a reply is appropriate, or null if no reply is needed.\n"
-            "  * subject: the reply email subject (usually 'Re: ' + original subject)\n"
-            "  * body: the draft reply text (professional, concise, without signature)\n"
-            "If there are no scheduling intents, use an empty array for proposals. Return JSON only.\n\n"
-            "IMPORTANT: Regardless of the timezone of any provided timestamps, return all proposal start/end datetimes in Hong Kong local time (Asia/Hong_Kong, UTC+08:00) using ISO 8601 with +08:00 offset."
-            "When parsing dates, consider the sender's location and use the appropriate date format (DD/MM for default or unspecified location, MM/DD for US/Canada)."
+            + SUMMARIZE_OUTPUT_INSTRUCTIONS
         )
 
         messages = [
-            {'role': 'system', 'content': system_prompt},
+            {'role': 'system', 'content': SUMMARIZE_SYSTEM_PROMPT},
             {'role': 'user', 'content': user_prompt},
         ]
 
@@ -275,6 +551,7 @@ class OpenAIClient:
                 temperature=temperature,
                 max_tokens=max_tokens,
                 context_tag='summarize',
+                cache_hint=['summarize', email_body, email_received_time, email_sender, cache_time],
             )
 
             parsed = _extract_json(text)
@@ -291,6 +568,44 @@ class OpenAIClient:
             # On API error, raise to let caller decide; include message for debugging
             raise RuntimeError(f"OpenAI-format API call failed: {e}")
 
+    def summarize_many(
+        self,
+        emails: Sequence[Mapping[str, Any]],
+        concurrency: int = 8,
+        interval_seconds: float = 0.0,
+    ) -> List[Any]:
+        """Summarize several emails and return the results in input order.
+
+        Each item holds `summarize_email` keyword arguments. Independent calls run on up to
+        `concurrency` threads sharing the keep-alive session, so a batch costs about the slowest
+        call rather than the sum of all calls. When `interval_seconds` is set (provider rate
+        limits), call starts are spaced at least that far apart while earlier calls are still
+        running, so slow completions still overlap. A failed call yields its exception in place
+        of a result.
+        """
+        start_lock = Lock()
+        next_start = [time.monotonic()]
+
+        def _summarize(kwargs: Mapping[str, Any]) -> Any:
+            if interval_seconds > 0:
+                # reserve the next start slot under the lock, then sleep outside it
+                with start_lock:
+                    now = time.monotonic()
+                    wait = next_start[0] - now
+                    next_start[0] = max(now, next_start[0]) + interval_seconds
+                if wait > 0:
+                    time.sleep(wait)
+            try:
+                return self.summarize_email(**kwargs)
+            except Exception as exc:
+                return exc
+
+        if concurrency <= 1 or len(emails) <= 1:
+            return [_summarize(kwargs) for kwargs in emails]
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(emails))) as pool:
+            return list(pool.map(_summarize, emails))
+
     def _chat_completion_with_tools(
         self,
         messages: List[Dict[str, Any]],
@@ -317,10 +632,6 @@ class OpenAIClient:
                 raise RuntimeError('API key and model are required when OPENAI_API_BASE is set')
             
             url = self.api_base.rstrip('/') + '/v1/chat/completions'
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
             payload = {
                 'model': self.model,
                 'messages': messages,
@@ -330,9 +641,9 @@ class OpenAIClient:
                 'tool_choice': 'auto'
             }
             
-            r = requests.post(url, headers=headers, json=payload, timeout=60)
+            r = self._get_session().post(url, data=_dumps(payload), timeout=60)
             r.raise_for_status()
-            resp = r.json()
+            resp = _loads(r.content)
             
             choice = resp.get('choices', [{}])[0]
             message = choice.get('message', {})
@@ -343,10 +654,11 @@ class OpenAIClient:
             }
         
         # Use openai SDK
-        if self._client is None:
+        client = self._get_openai_sdk()
+        if client is None:
             raise RuntimeError('OpenAI client not initialized')
         
-        response = self._client.chat.completions.create(
+        response = client.chat.completions.create(
             model=self.model,
             messages=messages,
             temperature=temperature,
@@ -375,12 +687,25 @@ class OpenAIClient:
             'tool_calls': tool_calls
         }
 
+    def _keyword_matcher(self, rules: Sequence[Mapping[str, Any]]) -> _KeywordRuleMatcher:
+        """Return the offline matcher for `rules`, rebuilding only when the rule set changes."""
+        fingerprint = tuple(
+            (rule.get('id') or rule.get('rule_id'), rule.get('label'), rule.get('reason'))
+            for rule in rules
+        )
+        cached = self._label_matcher
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        matcher = _KeywordRuleMatcher(rules)
+        self._label_matcher = (fingerprint, matcher)
+        return matcher
+
     def evaluate_label_rules(
         self,
         email_body: str,
         subject: str,
         sender: str,
-        rules: List[Dict[str, Any]],
+        rules: Sequence[Mapping[str, Any]],
         temperature: float = 0.0,
         max_tokens: int = 512,
     ) -> Dict[str, Any]:
@@ -397,42 +722,16 @@ class OpenAIClient:
 
         corpus = "\n".join(filter(None, [subject or "", sender or "", email_body or ""])).lower()
         if not self._is_ready():
-            matches: List[Dict[str, Any]] = []
-            for rule in rules:
-                rule_id = rule.get('id') or rule.get('rule_id')
-                label = (rule.get('label') or '').strip()
-                reason = (rule.get('reason') or '').strip()
-                if not rule_id or not (label or reason):
-                    continue
-                heuristics = [label.lower()] if label else []
-                heuristics += [token.lower() for token in reason.split() if len(token) > 3]
-                if any(token and token in corpus for token in heuristics):
-                    matches.append({
-                        'rule_id': rule_id,
-                        'confidence': 0.55,
-                        'explanation': 'Matched via offline keyword heuristic when LLM unavailable.'
-                    })
+            matches: List[Dict[str, Any]] = [
+                {
+                    'rule_id': rule_id,
+                    'confidence': 0.55,
+                    'explanation': 'Matched via offline keyword heuristic when LLM unavailable.'
+                }
+                for rule_id in self._keyword_matcher(rules).match(corpus)
+            ]
             return {'matches': matches}
 
-        system_prompt = (
-            "You are an intelligent email triage assistant that evaluates emails against user-defined labeling rules. "
-            "Your task is to determine which rules match a given email based on the rule's description/reason. "
-            "You must analyze the email content, subject, and sender carefully to make accurate matching decisions.\n\n"
-            "MATCHING GUIDELINES:\n"
-            "- Only match a rule when the email CLEARLY satisfies the condition described in the rule's reason field.\n"
-            "- Consider the full context: subject line, sender address/name, and email body content.\n"
-            "- Be conservative - when uncertain, do NOT match. False positives are worse than false negatives.\n"
-            "- A rule's 'label' field is just the tag name; the 'reason' field describes WHEN to apply it.\n"
-            "- For promotional/marketing rules, look for sales language, discount codes, unsubscribe links.\n"
-            "- For sender-based rules, check if sender email/name matches the described criteria.\n"
-            "- For content-based rules, look for keywords or themes mentioned in the reason.\n\n"
-            "CONFIDENCE SCORING:\n"
-            "- 0.9-1.0: Perfect match, email explicitly satisfies the rule condition.\n"
-            "- 0.7-0.9: Strong match, high confidence the rule applies.\n"
-            "- 0.5-0.7: Moderate match, rule likely applies but some ambiguity.\n"
-            "- Below 0.5: Do NOT include in matches - not confident enough.\n\n"
-            "Respond with JSON only (no markdown, no extra explanation)."
-        )
 
         # Build structured context for the user prompt
         rules_description = "\n".join([
@@ -458,7 +757,7 @@ class OpenAIClient:
         )
 
         messages = [
-            {'role': 'system', 'content': system_prompt},
+            {'role': 'system', 'content': LABEL_RULES_SYSTEM_PROMPT},
             {'role': 'user', 'content': user_prompt},
         ]
 